@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from .models import DailyCourseRollup, RollupWatermark
+
+
+@admin.register(DailyCourseRollup)
+class DailyCourseRollupAdmin(admin.ModelAdmin):
+    list_display = ("day", "course", "revenue", "payments", "enrollments_active")
+    list_filter = ("day",)
+    search_fields = ("course__title",)
+
+
+@admin.register(RollupWatermark)
+class RollupWatermarkAdmin(admin.ModelAdmin):
+    list_display = ("name", "position")
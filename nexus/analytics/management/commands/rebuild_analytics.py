@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from analytics.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute every daily analytics rollup from the payment and enrollment tables."
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} daily rollups."))
@@ -0,0 +1,54 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("courses", "0007_enrollment_updated_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RollupWatermark",
+            fields=[
+                ("name", models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ("position", models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="DailyCourseRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("revenue", models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ("payments", models.PositiveIntegerField(default=0)),
+                ("enrollments_pending", models.PositiveIntegerField(default=0)),
+                ("enrollments_active", models.PositiveIntegerField(default=0)),
+                ("enrollments_cancelled", models.PositiveIntegerField(default=0)),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_rollups",
+                        to="courses.course",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["day", "course"],
+                "constraints": [
+                    models.UniqueConstraint(fields=("course", "day"), name="rollup_course_day_uniq")
+                ],
+            },
+        ),
+    ]
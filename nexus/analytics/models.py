@@ -0,0 +1,39 @@
+from django.db import models
+
+
+class DailyCourseRollup(models.Model):
+    """
+    One course's payments and enrollments created on one UTC day. Written
+    only by analytics.rollups, which keeps it in step with the source tables.
+    """
+
+    course = models.ForeignKey(
+        "courses.Course", on_delete=models.CASCADE, related_name="daily_rollups"
+    )
+    day = models.DateField()
+    # Successful payments only.
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    payments = models.PositiveIntegerField(default=0)
+    # Enrollments created that day, by their current status.
+    enrollments_pending = models.PositiveIntegerField(default=0)
+    enrollments_active = models.PositiveIntegerField(default=0)
+    enrollments_cancelled = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["day", "course"]
+        constraints = [
+            models.UniqueConstraint(fields=["course", "day"], name="rollup_course_day_uniq")
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.course_id} @ {self.day}"
+
+
+class RollupWatermark(models.Model):
+    """How far (by source `updated_at`) a rollup has been brought up to date."""
+
+    name = models.CharField(max_length=64, primary_key=True)
+    position = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return f"{self.name} @ {self.position}"
@@ -0,0 +1,142 @@
+"""
+Incremental maintenance of DailyCourseRollup.
+
+Payments and enrollments are bucketed by course and the UTC day they were
+created. Each refresh looks for source rows whose `updated_at` moved past
+the watermark, recomputes just the (course, day) buckets they belong to and
+upserts them, so a status change on an old row is picked up as well as new
+rows. Rows updated in the last ANALYTICS_ROLLUP_SETTLE seconds are left for
+the next run, giving transactions still in flight time to commit.
+
+Deleted rows don't bump `updated_at`; `manage.py rebuild_analytics`
+recomputes everything from scratch.
+"""
+
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from courses.models import Enrollment
+from payments.models import Payment
+from .models import DailyCourseRollup, RollupWatermark
+
+WATERMARK = "daily-course"
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+# Courses per recompute query, well under SQLite's bound parameter limit.
+COURSE_BATCH = 500
+
+ENROLLMENT_FIELDS = {
+    Enrollment.Status.PENDING: "enrollments_pending",
+    Enrollment.Status.ACTIVE: "enrollments_active",
+    Enrollment.Status.CANCELLED: "enrollments_cancelled",
+}
+ROLLUP_FIELDS = ["revenue", "payments", *ENROLLMENT_FIELDS.values()]
+
+
+def _created_day():
+    return TruncDate("created_at", tzinfo=dt_timezone.utc)
+
+
+def touched_buckets(lower, upper):
+    """(course_id, day) of every payment or enrollment updated in (lower, upper]."""
+    buckets = set()
+    for model in (Payment, Enrollment):
+        buckets.update(
+            model.objects.filter(updated_at__gt=lower, updated_at__lte=upper)
+            .order_by()
+            .annotate(day=_created_day())
+            .values_list("course_id", "day")
+            .distinct()
+        )
+    return buckets
+
+
+def recompute_buckets(buckets):
+    """Recompute and upsert the given (course_id, day) buckets. Returns how many."""
+    by_course = {}
+    for course_id, day in buckets:
+        by_course.setdefault(course_id, []).append(day)
+    course_ids = sorted(by_course)
+    for i in range(0, len(course_ids), COURSE_BATCH):
+        batch = course_ids[i : i + COURSE_BATCH]
+        days = [day for course_id in batch for day in by_course[course_id]]
+        # One range scan per source table covering every bucket in the batch;
+        # results for days a course wasn't asked about are ignored.
+        window = {
+            "course_id__in": batch,
+            "created_at__gte": datetime.combine(min(days), time.min, dt_timezone.utc),
+            "created_at__lt": datetime.combine(
+                max(days) + timedelta(days=1), time.min, dt_timezone.utc
+            ),
+        }
+        rollups = {
+            (course_id, day): DailyCourseRollup(course_id=course_id, day=day)
+            for course_id in batch
+            for day in by_course[course_id]
+        }
+
+        payments = (
+            Payment.objects.filter(status=Payment.Status.SUCCESS, **window)
+            .order_by()
+            .annotate(day=_created_day())
+            .values("course_id", "day")
+            .annotate(revenue=Sum("amount"), count=Count("id"))
+        )
+        for row in payments:
+            rollup = rollups.get((row["course_id"], row["day"]))
+            if rollup is not None:
+                rollup.revenue, rollup.payments = row["revenue"], row["count"]
+
+        enrollments = (
+            Enrollment.objects.filter(**window)
+            .order_by()
+            .annotate(day=_created_day())
+            .values("course_id", "day", "status")
+            .annotate(count=Count("id"))
+        )
+        for row in enrollments:
+            rollup = rollups.get((row["course_id"], row["day"]))
+            if rollup is not None and row["status"] in ENROLLMENT_FIELDS:
+                setattr(rollup, ENROLLMENT_FIELDS[row["status"]], row["count"])
+
+        DailyCourseRollup.objects.bulk_create(
+            rollups.values(),
+            update_conflicts=True,
+            unique_fields=["course", "day"],
+            update_fields=ROLLUP_FIELDS,
+            batch_size=COURSE_BATCH,
+        )
+    return len(buckets)
+
+
+def refresh_rollups(now=None):
+    """Bring the rollups up to date with the source tables. Returns the buckets rewritten."""
+    upper = (now or timezone.now()) - timedelta(seconds=settings.ANALYTICS_ROLLUP_SETTLE)
+    with transaction.atomic():
+        # Serializes concurrent refreshes on backends with row locks.
+        watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(
+            name=WATERMARK, defaults={"position": EPOCH}
+        )
+        if upper <= watermark.position:
+            return 0
+        rewritten = recompute_buckets(touched_buckets(watermark.position, upper))
+        watermark.position = upper
+        watermark.save(update_fields=["position"])
+    return rewritten
+
+
+def rebuild_rollups():
+    """Drop every rollup and recompute from the beginning."""
+    with transaction.atomic():
+        DailyCourseRollup.objects.all().delete()
+        RollupWatermark.objects.filter(name=WATERMARK).delete()
+        return refresh_rollups()
+
+
+def rollups_as_of():
+    """The time up to which the rollups reflect the source tables, or None."""
+    return RollupWatermark.objects.filter(name=WATERMARK).values_list("position", flat=True).first()
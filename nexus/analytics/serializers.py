@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import serializers
+
+
+class TeacherAnalyticsQuerySerializer(serializers.Serializer):
+    start = serializers.DateField(required=False, help_text="First day, inclusive (UTC).")
+    end = serializers.DateField(required=False, help_text="Last day, inclusive (UTC).")
+    course = serializers.IntegerField(required=False, help_text="Limit to one course.")
+
+    def validate(self, attrs):
+        # Default to the 30 days ending today.
+        attrs.setdefault("end", timezone.now().date())
+        attrs.setdefault("start", attrs["end"] - timedelta(days=29))
+        if attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError({"start": "Must not be after end."})
+        if (attrs["end"] - attrs["start"]).days >= settings.ANALYTICS_MAX_RANGE_DAYS:
+            raise serializers.ValidationError(
+                {"end": f"Ranges are limited to {settings.ANALYTICS_MAX_RANGE_DAYS} days."}
+            )
+        return attrs
@@ -0,0 +1,8 @@
+from celery import shared_task
+
+
+@shared_task
+def refresh_analytics_rollups():
+    from analytics.rollups import refresh_rollups
+
+    return f"Refreshed {refresh_rollups()} daily rollups"
@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from courses.models import Course, Enrollment
+from payments.models import Payment
+from users.models import User
+from .rollups import refresh_rollups
+
+
+def refresh():
+    # Include rows written just now, which a scheduled run would leave to settle.
+    return refresh_rollups(now=timezone.now() + timedelta(seconds=settings.ANALYTICS_ROLLUP_SETTLE))
+
+
+class TeacherAnalyticsTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = User.objects.create_user("teacher@example.com", "password", role=User.Role.TEACHER)
+        other = User.objects.create_user("other@example.com", "password", role=User.Role.TEACHER)
+        cls.learner = User.objects.create_user("learner@example.com", "password", role=User.Role.LEARNER)
+        cls.course = Course.objects.create(teacher=cls.teacher, title="Course", description="")
+        other_course = Course.objects.create(teacher=other, title="Other", description="")
+        for course in (cls.course, other_course):
+            Payment.objects.create(
+                learner=cls.learner, course=course, amount=25, status=Payment.Status.SUCCESS
+            )
+            Enrollment.objects.create(
+                learner=cls.learner, course=course, status=Enrollment.Status.ACTIVE
+            )
+        Payment.objects.create(
+            learner=cls.learner, course=cls.course, amount=99, status=Payment.Status.FAILED
+        )
+
+    def fetch(self):
+        self.client.force_authenticate(self.teacher)
+        response = self.client.get("/v1/analytics/teacher/")
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_reports_only_the_teachers_courses(self):
+        self.assertEqual(refresh(), 2)
+        (course,) = self.fetch()["courses"]
+        self.assertEqual(course["course_id"], self.course.id)
+        self.assertEqual((course["revenue"], course["payments"]), ("25.00", 1))
+        self.assertEqual(course["enrollments"]["ACTIVE"], 1)
+
+    def test_refresh_picks_up_status_changes(self):
+        refresh()
+        enrollment = Enrollment.objects.get(course=self.course)
+        enrollment.status = Enrollment.Status.CANCELLED
+        enrollment.save()
+        self.assertEqual(refresh(), 1)
+        (course,) = self.fetch()["courses"]
+        self.assertEqual(course["enrollments"], {"PENDING": 0, "ACTIVE": 0, "CANCELLED": 1})
+
+    def test_learners_are_forbidden(self):
+        self.client.force_authenticate(self.learner)
+        self.assertEqual(self.client.get("/v1/analytics/teacher/").status_code, 403)
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import TeacherAnalyticsView
+
+urlpatterns = [
+    path("teacher/", TeacherAnalyticsView.as_view(), name="teacher-analytics"),
+]
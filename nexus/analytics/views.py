@@ -0,0 +1,68 @@
+from django.db.models import Sum
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from nexus.docs import swagger_auto_schema
+from users.permissions import IsTeacher
+from .models import DailyCourseRollup
+from .rollups import ROLLUP_FIELDS, rollups_as_of
+from .serializers import TeacherAnalyticsQuerySerializer
+
+
+def _figures(row):
+    return {
+        # Rendered like the API's other money fields.
+        "revenue": f"{row['revenue']:.2f}",
+        "payments": row["payments"],
+        "enrollments": {
+            "PENDING": row["enrollments_pending"],
+            "ACTIVE": row["enrollments_active"],
+            "CANCELLED": row["enrollments_cancelled"],
+        },
+    }
+
+
+class TeacherAnalyticsView(APIView):
+    """
+    Revenue and enrollments for the teacher's courses over a date range,
+    per course per day and per course in total. Answered from the daily
+    rollups alone; `as_of` says how current they are.
+    """
+
+    swagger_tags = ["Analytics"]
+    permission_classes = [permissions.IsAuthenticated, IsTeacher]
+
+    @swagger_auto_schema(query_serializer=TeacherAnalyticsQuerySerializer)
+    def get(self, request):
+        params = TeacherAnalyticsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        start, end = params.validated_data["start"], params.validated_data["end"]
+
+        rollups = DailyCourseRollup.objects.filter(
+            course__teacher=request.user, day__gte=start, day__lte=end
+        )
+        if "course" in params.validated_data:
+            rollups = rollups.filter(course_id=params.validated_data["course"])
+
+        daily = rollups.order_by("day", "course_id").values("day", "course_id", *ROLLUP_FIELDS)
+        totals = (
+            rollups.order_by("course_id")
+            .values("course_id", "course__title")
+            .annotate(**{field: Sum(field) for field in ROLLUP_FIELDS})
+        )
+        return Response(
+            {
+                "start": start,
+                "end": end,
+                "as_of": rollups_as_of(),
+                "courses": [
+                    {"course_id": row["course_id"], "title": row["course__title"], **_figures(row)}
+                    for row in totals
+                ],
+                "daily": [
+                    {"day": row["day"], "course_id": row["course_id"], **_figures(row)}
+                    for row in daily
+                ],
+            }
+        )
@@ -0,0 +1,127 @@
+"""
+Async twins of the catalog read endpoints, mounted under /v1/async/.
+
+Each view borrows the queryset, serializer and permissions of the matching
+viewset action, so both paths return the same data, but it fetches rows
+with the async ORM (acount, aiterator) and serializes on the event loop.
+Under ASGI a request then only leaves the loop for the queries themselves
+instead of running the whole view in the thread shared by sync views.
+Querysets must prefetch everything their serializer renders: a lazy
+relation access raises SynchronousOnlyOperation here.
+"""
+
+from abc import ABC, abstractmethod
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404
+from rest_framework import generics
+from rest_framework.response import Response
+
+from nexus.replicas import ReplicaReadMixin
+from nexus.views import AsyncAPIViewMixin
+from .cache import CatalogCacheMixin
+from .views import CourseViewSet, LessonViewSet, CourseReviewViewSet, TeacherReviewViewSet
+
+
+class AsyncCatalogView(
+    ReplicaReadMixin, CatalogCacheMixin, AsyncAPIViewMixin, generics.GenericAPIView, ABC
+):
+    viewset_class = None
+    action = None
+    # Whether responses go through the catalog cache, as in the viewset.
+    cached = True
+
+    def get_viewset(self):
+        if not hasattr(self, "_viewset"):
+            self._viewset = self.viewset_class(
+                request=self.request,
+                args=self.args,
+                kwargs=self.kwargs,
+                action=self.action,
+                format_kwarg=self.format_kwarg,
+            )
+        return self._viewset
+
+    def get_queryset(self):
+        return self.get_viewset().get_queryset()
+
+    def get_serializer_class(self):
+        return self.get_viewset().get_serializer_class()
+
+    def get_permissions(self):
+        return self.get_viewset().get_permissions()
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            pagination_class = self.viewset_class.pagination_class
+            self._paginator = pagination_class() if pagination_class else None
+        return self._paginator
+
+    async def get(self, request, *args, **kwargs):
+        if self.cached:
+            return await self.acached_response(self.read, request, *args, **kwargs)
+        return await self.read(request, *args, **kwargs)
+
+    @abstractmethod
+    async def read(self, request, *args, **kwargs):
+        """Build the uncached response for the viewset action."""
+
+
+class AsyncListView(AsyncCatalogView):
+    action = "list"
+
+    async def read(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        if self.paginator is not None:
+            page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(
+            [obj async for obj in queryset.aiterator(chunk_size=500)], many=True
+        )
+        return Response(serializer.data)
+
+
+class AsyncRetrieveView(AsyncCatalogView):
+    action = "retrieve"
+
+    async def read(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        try:
+            instance = await queryset.aget(pk=self.kwargs["pk"])
+        # Same responses as rest_framework.generics.get_object_or_404().
+        except queryset.model.DoesNotExist:
+            raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+        except (TypeError, ValueError, DjangoValidationError):
+            raise Http404
+        self.check_object_permissions(request, instance)
+        return Response(self.get_serializer(instance).data)
+
+
+class AsyncCourseListView(AsyncListView):
+    swagger_tags = ["Courses"]
+    viewset_class = CourseViewSet
+
+
+class AsyncCourseDetailView(AsyncRetrieveView):
+    swagger_tags = ["Courses"]
+    viewset_class = CourseViewSet
+
+
+class AsyncLessonListView(AsyncListView):
+    swagger_tags = ["Lessons"]
+    viewset_class = LessonViewSet
+
+
+class AsyncCourseReviewListView(AsyncListView):
+    swagger_tags = ["Course Reviews"]
+    viewset_class = CourseReviewViewSet
+    cached = False
+
+
+class AsyncTeacherReviewListView(AsyncListView):
+    swagger_tags = ["Teacher Reviews"]
+    viewset_class = TeacherReviewViewSet
+    cached = False
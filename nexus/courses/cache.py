@@ -0,0 +1,161 @@
+import hashlib
+import json
+from urllib.parse import urlsplit, urlunsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+VERSION_KEY = "catalog:version"
+
+# Pagination links, cached host-relative and made absolute for each request.
+LINK_FIELDS = ("next", "previous")
+
+
+def catalog_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+async def acatalog_version():
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, 1, None)
+        version = await cache.aget(VERSION_KEY, 1)
+    return version
+
+
+def invalidate_catalog():
+    """
+    Drop every cached catalog response once the current transaction commits.
+    Keys embed the catalog version, so bumping it orphans all of them at once.
+    """
+
+    def bump():
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.set(VERSION_KEY, 1, None)
+
+    transaction.on_commit(bump)
+
+
+def compute_etag(data):
+    payload = json.dumps(data, cls=JSONEncoder, sort_keys=True, separators=(",", ":"))
+    return '"%s"' % hashlib.md5(payload.encode(), usedforsecurity=False).hexdigest()
+
+
+def etag_matches(if_none_match, etag):
+    """Whether an If-None-Match header matches `etag`, using the weak comparison it calls for."""
+    etags = parse_etags(if_none_match)
+    if etags == ["*"]:
+        return True
+    return etag.removeprefix("W/") in {tag.removeprefix("W/") for tag in etags}
+
+
+def _map_links(data, transform):
+    if not isinstance(data, dict):
+        return data
+    return {
+        key: transform(value) if key in LINK_FIELDS and value else value
+        for key, value in data.items()
+    }
+
+
+def relative_links(data):
+    """`data` with its pagination links stripped of scheme and host."""
+
+    def relative(link):
+        parts = urlsplit(link)
+        return urlunsplit(("", "", parts.path, parts.query, ""))
+
+    return _map_links(data, relative)
+
+
+def absolute_links(request, data):
+    return _map_links(data, request.build_absolute_uri)
+
+
+class CatalogCacheMixin:
+    """
+    Caches list/retrieve responses per audience and query string, with
+    ETag/If-None-Match support. Pagination links are stored without the
+    host, so each request gets links to the host it used. Anonymous users and learners see the same
+    catalog; teachers also see their own drafts, so they get their own keys.
+
+    Rating and enrollment counters on cached courses may lag by up to
+    CATALOG_CACHE_TIMEOUT; only catalog edits invalidate the cache.
+    """
+
+    def catalog_audience(self, request):
+        user = request.user
+        if user.is_authenticated and getattr(user, "role", None) == "TEACHER":
+            return f"teacher:{user.pk}"
+        return "public"
+
+    def catalog_cache_key(self, request, version=None):
+        if version is None:
+            version = catalog_version()
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.items()))
+        return ":".join(
+            [
+                "catalog",
+                str(version),
+                self.catalog_audience(request),
+                request.path,
+                query,
+                request.accepted_renderer.format,
+            ]
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key = self.catalog_cache_key(request)
+        cached = cache.get(key)
+        if cached is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            data = relative_links(response.data)
+            etag = compute_etag(data)
+            cache.set(key, (etag, data), settings.CATALOG_CACHE_TIMEOUT)
+        else:
+            etag, data = cached
+            response = Response(absolute_links(request, data))
+        return self.conditional_response(request, response, etag)
+
+    async def acached_response(self, handler, request, *args, **kwargs):
+        """cached_response() for an async `handler`, using the async cache API."""
+        key = self.catalog_cache_key(request, await acatalog_version())
+        cached = await cache.aget(key)
+        if cached is None:
+            response = await handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            data = relative_links(response.data)
+            etag = compute_etag(data)
+            await cache.aset(key, (etag, data), settings.CATALOG_CACHE_TIMEOUT)
+        else:
+            etag, data = cached
+            response = Response(absolute_links(request, data))
+        return self.conditional_response(request, response, etag)
+
+    def conditional_response(self, request, response, etag):
+        if etag_matches(request.headers.get("If-None-Match", ""), etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        response["ETag"] = etag
+        patch_vary_headers(response, ["Authorization", "Cookie"])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Course, CourseReview, Enrollment, TeacherReview
+
+User = get_user_model()
+
+
+def _shift(field, delta):
+    # Clamp at zero so a drifted counter can't violate the unsigned column;
+    # recompute_counters repairs the drift itself.
+    return Greatest(F(field) + delta, Value(0))
+
+
+def adjust_course_rating(course_id, rating_delta, count_delta=0):
+    Course.objects.filter(pk=course_id).update(
+        rating_sum=_shift("rating_sum", rating_delta),
+        rating_count=_shift("rating_count", count_delta),
+    )
+
+
+def adjust_teacher_rating(teacher_id, rating_delta, count_delta=0):
+    User.objects.filter(pk=teacher_id).update(
+        rating_sum=_shift("rating_sum", rating_delta),
+        rating_count=_shift("rating_count", count_delta),
+    )
+
+
+def adjust_active_enrollments(course_id, delta):
+    Course.objects.filter(pk=course_id).update(
+        active_enrollment_count=_shift("active_enrollment_count", delta)
+    )
+
+
+def refresh_active_enrollments(course_id):
+    """Recount a course's ACTIVE enrollments in one UPDATE (served by enrollment_active_idx)."""
+    Course.objects.filter(pk=course_id).update(
+        active_enrollment_count=_aggregate(
+            Enrollment.objects.filter(status=Enrollment.Status.ACTIVE), "course", Count("id")
+        )
+    )
+
+
+def _aggregate(queryset, group_field, aggregate):
+    """Correlated subquery returning a single aggregate per outer row, 0 when empty."""
+    subquery = (
+        queryset.filter(**{group_field: OuterRef("pk")})
+        .order_by()
+        .values(group_field)
+        .annotate(total=aggregate)
+        .values("total")
+    )
+    return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+
+def recompute_counters():
+    """
+    Rebuild every denormalized counter from the source tables in bulk.
+    Returns the number of (courses, users) rows updated.
+    """
+    courses = Course.objects.update(
+        rating_sum=_aggregate(CourseReview.objects.all(), "course", Sum("rating")),
+        rating_count=_aggregate(CourseReview.objects.all(), "course", Count("id")),
+        active_enrollment_count=_aggregate(
+            Enrollment.objects.filter(status=Enrollment.Status.ACTIVE), "course", Count("id")
+        ),
+    )
+    users = User.objects.update(
+        rating_sum=_aggregate(TeacherReview.objects.all(), "teacher", Sum("rating")),
+        rating_count=_aggregate(TeacherReview.objects.all(), "teacher", Count("id")),
+    )
+    return courses, users
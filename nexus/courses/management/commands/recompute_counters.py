@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from courses.counters import recompute_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute denormalized rating and enrollment counters from the source tables."
+
+    def handle(self, *args, **options):
+        courses, users = recompute_counters()
+        self.stdout.write(
+            self.style.SUCCESS(f"Counters recomputed for {courses} courses and {users} users.")
+        )
@@ -0,0 +1,55 @@
+# Generated by Django 6.0.1 on 2026-10-18 17:18
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_counters(apps, schema_editor):
+    Course = apps.get_model("courses", "Course")
+    CourseReview = apps.get_model("courses", "CourseReview")
+    Enrollment = apps.get_model("courses", "Enrollment")
+    TeacherReview = apps.get_model("courses", "TeacherReview")
+    User = apps.get_model("users", "User")
+
+    ratings = CourseReview.objects.values("course").annotate(total=Sum("rating"), count=Count("id"))
+    for row in ratings.order_by():
+        Course.objects.filter(pk=row["course"]).update(
+            rating_sum=row["total"], rating_count=row["count"]
+        )
+    active = (
+        Enrollment.objects.filter(status="ACTIVE").values("course").annotate(count=Count("id"))
+    )
+    for row in active.order_by():
+        Course.objects.filter(pk=row["course"]).update(active_enrollment_count=row["count"])
+    ratings = TeacherReview.objects.values("teacher").annotate(total=Sum("rating"), count=Count("id"))
+    for row in ratings.order_by():
+        User.objects.filter(pk=row["teacher"]).update(
+            rating_sum=row["total"], rating_count=row["count"]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_coursereview_teacherreview'),
+        ('users', '0002_user_rating_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='active_enrollment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
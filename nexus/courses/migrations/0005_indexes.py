@@ -0,0 +1,63 @@
+# Generated by Django 6.0.1 on 2026-10-18 17:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_course_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='course',
+            options={'ordering': ['-created_at']},
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['teacher', '-created_at'], name='course_teacher_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-created_at'], name='course_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='coursereview',
+            index=models.Index(fields=['-created_at', '-id'], name='coursereview_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='coursereview',
+            index=models.Index(fields=['course', '-created_at', '-id'], name='coursereview_course_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['learner', 'status'], name='enrollment_learner_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['learner', '-created_at', '-id'], name='enrollment_learner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['course', '-created_at', '-id'], name='enrollment_course_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(condition=models.Q(('status', 'ACTIVE')), fields=['course', 'learner'], name='enrollment_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lesson',
+            index=models.Index(fields=['course', 'position', 'created_at'], name='lesson_course_position_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teacherreview',
+            index=models.Index(fields=['-created_at', '-id'], name='teacherreview_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teacherreview',
+            index=models.Index(fields=['teacher', '-created_at', '-id'], name='teacherreview_teacher_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:02
+
+from django.db import migrations
+
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE courses_course_search USING fts5("
+    "title, description, lessons, teacher, tokenize = 'porter unicode61')",
+]
+POSTGRES_FORWARD = [
+    "CREATE TABLE courses_course_search ("
+    "course_id bigint PRIMARY KEY REFERENCES courses_course (id) ON DELETE CASCADE "
+    "DEFERRABLE INITIALLY DEFERRED, document tsvector NOT NULL)",
+    "CREATE INDEX courses_course_search_document_idx ON courses_course_search USING GIN (document)",
+]
+
+
+def create_search_table(apps, schema_editor):
+    statements = {"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD}
+    for sql in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute("DROP TABLE IF EXISTS courses_course_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0005_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.db.models import Q
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 User = settings.AUTH_USER_MODEL
@@ -13,12 +14,33 @@ class Course(models.Model):
     description = models.TextField()
     price = models.DecimalField(max_digits=8, decimal_places=2, default=0)
     is_published = models.BooleanField(default=False)
+    # Denormalized counters, maintained by courses.counters.
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    active_enrollment_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["teacher", "-created_at"], name="course_teacher_created_idx"),
+            models.Index(
+                fields=["-created_at"],
+                condition=Q(is_published=True),
+                name="course_published_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         return self.title
 
+    @property
+    def average_rating(self):
+        if not self.rating_count:
+            return None
+        return round(self.rating_sum / self.rating_count, 2)
+
 
 class Lesson(models.Model):
     course = models.ForeignKey(
@@ -32,6 +54,11 @@ class Lesson(models.Model):
 
     class Meta:
         ordering = ["position", "created_at"]
+        indexes = [
+            models.Index(
+                fields=["course", "position", "created_at"], name="lesson_course_position_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.course.title} - {self.title}"
@@ -59,6 +86,22 @@ class Enrollment(models.Model):
     class Meta:
         unique_together = ("learner", "course")
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["learner", "status"], name="enrollment_learner_status_idx"),
+            models.Index(
+                fields=["learner", "-created_at", "-id"], name="enrollment_learner_created_idx"
+            ),
+            models.Index(
+                fields=["course", "-created_at", "-id"], name="enrollment_course_created_idx"
+            ),
+            models.Index(
+                fields=["course", "learner"],
+                condition=Q(status="ACTIVE"),
+                name="enrollment_active_idx",
+            ),
+            # Incremental analytics rollups scan rows changed since a watermark.
+            models.Index(fields=["updated_at"], name="enrollment_updated_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.learner} - {self.course}"
@@ -80,6 +123,12 @@ class CourseReview(models.Model):
     class Meta:
         unique_together = ("learner", "course")
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="coursereview_created_idx"),
+            models.Index(
+                fields=["course", "-created_at", "-id"], name="coursereview_course_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.course} ({self.rating}/5) by {self.learner}"
@@ -104,6 +153,12 @@ class TeacherReview(models.Model):
     class Meta:
         unique_together = ("learner", "teacher")
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="teacherreview_created_idx"),
+            models.Index(
+                fields=["teacher", "-created_at", "-id"], name="teacherreview_teacher_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.teacher} ({self.rating}/5) by {self.learner}"
@@ -0,0 +1,131 @@
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Prefetch
+from django.utils.module_loading import import_string
+
+from .models import Course, Lesson
+
+SEARCH_TABLE = "courses_course_search"
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def course_documents(course_ids=None):
+    """Yield (course_id, title, description, lesson titles, teacher name) rows to index."""
+    qs = Course.objects.select_related("teacher").prefetch_related(
+        Prefetch("lessons", queryset=Lesson.objects.only("id", "course_id", "title"))
+    )
+    if course_ids is not None:
+        qs = qs.filter(id__in=course_ids)
+    for course in qs.iterator(chunk_size=500):
+        teacher = course.teacher
+        yield (
+            course.id,
+            course.title,
+            course.description,
+            " ".join(lesson.title for lesson in course.lessons.all()),
+            teacher.get_full_name() or teacher.email,
+        )
+
+
+class SQLiteFTSBackend:
+    """Inverted index in an FTS5 virtual table whose rowid is the course id."""
+
+    def index(self, course_ids):
+        rows = list(course_documents(course_ids))
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [(pk,) for pk in course_ids]
+            )
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, title, description, lessons, teacher) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                rows,
+            )
+
+    @transaction.atomic
+    def rebuild(self):
+        # One transaction, so searches keep seeing the old index until it's replaced.
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        ids = list(Course.objects.values_list("id", flat=True))
+        for start in range(0, len(ids), 500):
+            self.index(ids[start:start + 500])
+        return len(ids)
+
+    def search(self, query, limit):
+        tokens = TOKEN_RE.findall(query)
+        if not tokens:
+            return []
+        # Quote every token so user input can't inject FTS5 syntax; the last
+        # one is a prefix match to support search-as-you-type.
+        match = " ".join(f'"{token}"' for token in tokens) + "*"
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s "
+                f"ORDER BY bm25({SEARCH_TABLE}, 10.0, 2.0, 1.0, 5.0) LIMIT %s",
+                [match, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend:
+    """Weighted tsvector per course in a table with a GIN index."""
+
+    document_sql = (
+        "setweight(to_tsvector('english', %s), 'A') || "
+        "setweight(to_tsvector('english', %s), 'C') || "
+        "setweight(to_tsvector('english', %s), 'D') || "
+        "setweight(to_tsvector('simple', %s), 'B')"
+    )
+
+    def index(self, course_ids):
+        rows = list(course_documents(course_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE course_id = ANY(%s)", [list(course_ids)])
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (course_id, document) VALUES (%s, {self.document_sql})",
+                rows,
+            )
+
+    @transaction.atomic
+    def rebuild(self):
+        # One transaction, so searches keep seeing the old index until it's
+        # replaced; DELETE rather than TRUNCATE, whose lock would block them.
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        ids = list(Course.objects.values_list("id", flat=True))
+        for start in range(0, len(ids), 500):
+            self.index(ids[start:start + 500])
+        return len(ids)
+
+    def search(self, query, limit):
+        if not TOKEN_RE.search(query):
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT course_id FROM {SEARCH_TABLE}, websearch_to_tsquery('english', %s) q "
+                "WHERE document @@ q ORDER BY ts_rank(document, q) DESC, course_id LIMIT %s",
+                [query, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+BACKENDS = {
+    "sqlite": SQLiteFTSBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+
+def get_backend():
+    path = getattr(settings, "COURSE_SEARCH_BACKEND", None)
+    if path:
+        return import_string(path)()
+    return BACKENDS[connection.vendor]()
+
+
+def reindex_courses(course_ids):
+    """Refresh the index entries for `course_ids` once the current transaction commits."""
+    course_ids = list(course_ids)
+    transaction.on_commit(lambda: get_backend().index(course_ids))
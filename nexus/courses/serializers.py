@@ -1,25 +1,56 @@
 from rest_framework import serializers
+from rest_framework.exceptions import PermissionDenied
 from django.contrib.auth import get_user_model
 
+from nexus.fieldsets import SparseFieldsetMixin
 from users.serializers import UserSerializer
 from .models import Course, Lesson, Enrollment, CourseReview, TeacherReview
 
 User = get_user_model()
 
+BULK_MAX_ITEMS = 1000
 
-class LessonSerializer(serializers.ModelSerializer):
+
+class LessonSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Lesson
+        expandable_fields = {"course": "courses.serializers.CourseSerializer"}
         fields = ["id", "course", "title", "video_url", "position", "created_at", "updated_at"]
         read_only_fields = ["id", "created_at", "updated_at"]
 
 
-class CourseSerializer(serializers.ModelSerializer):
-    teacher = UserSerializer(read_only=True)
-    lessons = LessonSerializer(many=True, read_only=True)
+class BulkLessonItemSerializer(serializers.ModelSerializer):
+    position = serializers.IntegerField(min_value=1, required=False)
+
+    class Meta:
+        model = Lesson
+        fields = ["title", "video_url", "position"]
+
+
+class BulkLessonSerializer(serializers.Serializer):
+    """
+    A batch of lessons for one course. Lessons with a `position` are inserted
+    at that slot (shifting later ones down); the rest are appended in order.
+    """
+
+    course = serializers.PrimaryKeyRelatedField(queryset=Course.objects.all())
+    lessons = BulkLessonItemSerializer(many=True, allow_empty=False, max_length=BULK_MAX_ITEMS)
+
+    def validate_course(self, course):
+        if course.teacher_id != self.context["request"].user.id:
+            raise PermissionDenied("You can only add lessons to your own courses.")
+        return course
+
+
+class CourseSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    average_rating = serializers.FloatField(read_only=True)
 
     class Meta:
         model = Course
+        expandable_fields = {
+            "teacher": UserSerializer,
+            "lessons": (LessonSerializer, {"many": True}),
+        }
         fields = [
             "id",
             "teacher",
@@ -27,15 +58,66 @@ class CourseSerializer(serializers.ModelSerializer):
             "description",
             "price",
             "is_published",
+            "average_rating",
+            "rating_count",
+            "active_enrollment_count",
             "lessons",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "teacher", "lessons", "created_at", "updated_at"]
+        read_only_fields = [
+            "id",
+            "teacher",
+            "average_rating",
+            "rating_count",
+            "active_enrollment_count",
+            "lessons",
+            "created_at",
+            "updated_at",
+        ]
+
+
+class CourseSummarySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Compact course representation for catalog listings.
+    Expects the queryset to be annotated with `lesson_count`.
+    """
 
+    teacher_name = serializers.SerializerMethodField()
+    lesson_count = serializers.IntegerField(read_only=True)
+    average_rating = serializers.FloatField(read_only=True)
+    total_duration = serializers.SerializerMethodField()
 
-class EnrollmentSerializer(serializers.ModelSerializer):
-    course = CourseSerializer(read_only=True)
+    class Meta:
+        model = Course
+        fields = [
+            "id",
+            "teacher_id",
+            "teacher_name",
+            "title",
+            "description",
+            "price",
+            "is_published",
+            "average_rating",
+            "rating_count",
+            "active_enrollment_count",
+            "lesson_count",
+            "total_duration",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+        field_relations = {"teacher_name": ["teacher"]}
+
+    def get_teacher_name(self, obj):
+        return obj.teacher.get_full_name() or obj.teacher.email
+
+    def get_total_duration(self, obj):
+        # Lessons don't track a duration yet; kept so clients can rely on the key.
+        return None
+
+
+class EnrollmentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     course_id = serializers.PrimaryKeyRelatedField(
         queryset=Course.objects.filter(is_published=True),
         source="course",
@@ -44,6 +126,7 @@ class EnrollmentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Enrollment
+        expandable_fields = {"course": CourseSerializer}
         fields = [
             "id",
             "course",
@@ -56,9 +139,29 @@ class EnrollmentSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "course", "status", "progress", "created_at", "updated_at"]
 
 
-class CourseReviewSerializer(serializers.ModelSerializer):
-    learner = UserSerializer(read_only=True)
-    course = CourseSerializer(read_only=True)
+class BulkEnrollmentSerializer(serializers.Serializer):
+    course_id = serializers.PrimaryKeyRelatedField(queryset=Course.objects.all(), source="course")
+    learner_ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=BULK_MAX_ITEMS
+    )
+
+    def validate_course_id(self, course):
+        if course.teacher_id != self.context["request"].user.id:
+            raise PermissionDenied("You can only enroll learners in your own courses.")
+        return course
+
+    def validate_learner_ids(self, learner_ids):
+        learner_ids = list(dict.fromkeys(learner_ids))
+        found = set(
+            User.objects.filter(id__in=learner_ids, role=User.Role.LEARNER).values_list("id", flat=True)
+        )
+        missing = [learner_id for learner_id in learner_ids if learner_id not in found]
+        if missing:
+            raise serializers.ValidationError(f"Unknown learners: {missing}")
+        return learner_ids
+
+
+class CourseReviewSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     course_id = serializers.PrimaryKeyRelatedField(
         queryset=Course.objects.filter(is_published=True),
         source="course",
@@ -67,6 +170,7 @@ class CourseReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = CourseReview
+        expandable_fields = {"learner": UserSerializer, "course": CourseSerializer}
         fields = [
             "id",
             "learner",
@@ -100,15 +204,14 @@ class CourseReviewSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class TeacherReviewSerializer(serializers.ModelSerializer):
-    learner = UserSerializer(read_only=True)
-    teacher = UserSerializer(read_only=True)
+class TeacherReviewSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     teacher_id = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.none(), write_only=True
     )
 
     class Meta:
         model = TeacherReview
+        expandable_fields = {"learner": UserSerializer, "teacher": UserSerializer}
         fields = [
             "id",
             "learner",
@@ -1,3 +1,460 @@
-from django.test import TestCase
+from unittest import skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from users.models import User
+from .cache import invalidate_catalog
+from .counters import adjust_course_rating, adjust_teacher_rating, recompute_counters
+from .models import Course, Lesson, Enrollment, CourseReview, TeacherReview
+from .search import get_backend
+
+
+def query_plan(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return " / ".join(row[-1] for row in cursor.fetchall())
+
+
+@skipUnless(connection.vendor == "sqlite", "Plans are asserted against SQLite's EXPLAIN QUERY PLAN.")
+class ListQueryIndexTests(APITestCase):
+    """The main list endpoints must be served by the Meta.indexes on each model."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = User.objects.create_user("teacher@example.com", "password", role=User.Role.TEACHER)
+        cls.learner = User.objects.create_user("learner@example.com", "password", role=User.Role.LEARNER)
+        cls.course = Course.objects.create(
+            teacher=cls.teacher, title="Course", description="", is_published=True
+        )
+        Lesson.objects.create(course=cls.course, title="Lesson", video_url="https://example.com/1")
+        Enrollment.objects.create(
+            learner=cls.learner, course=cls.course, status=Enrollment.Status.ACTIVE
+        )
+        CourseReview.objects.create(learner=cls.learner, course=cls.course, rating=5)
+        TeacherReview.objects.create(learner=cls.learner, teacher=cls.teacher, rating=5)
+
+    def setUp(self):
+        # Catalog responses are cached; make sure every request reaches the database.
+        cache.clear()
+
+    def list_plan(self, url, table, user=None):
+        """EXPLAIN the query that fetched rows from `table` while serving `url`."""
+        self.client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        selects = [
+            q["sql"]
+            for q in ctx.captured_queries
+            if q["sql"].startswith("SELECT") and f'FROM "{table}"' in q["sql"]
+        ]
+        self.assertTrue(selects, f"no query against {table} for {url}")
+        return query_plan(selects[-1])
+
+    def test_published_course_list(self):
+        plan = self.list_plan("/v1/courses/", "courses_course")
+        self.assertIn("course_published_idx", plan)
+
+    def test_lessons_by_course(self):
+        plan = self.list_plan(f"/v1/lessons/?course={self.course.id}", "courses_lesson")
+        self.assertIn("lesson_course_position_idx", plan)
+
+    def test_learner_enrollments(self):
+        plan = self.list_plan("/v1/enrollments/", "courses_enrollment", self.learner)
+        self.assertIn("enrollment_learner_created_idx", plan)
+
+    def test_course_reviews(self):
+        plan = self.list_plan(f"/v1/course-reviews/?course={self.course.id}", "courses_coursereview")
+        self.assertIn("coursereview_course_idx", plan)
+
+    def test_teacher_reviews(self):
+        plan = self.list_plan(f"/v1/teacher-reviews/?teacher={self.teacher.id}", "courses_teacherreview")
+        self.assertIn("teacherreview_teacher_idx", plan)
+
+
+class SparseFieldsetTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = User.objects.create_user("teacher@example.com", "password", role=User.Role.TEACHER)
+        cls.learner = User.objects.create_user("learner@example.com", "password", role=User.Role.LEARNER)
+        cls.course = Course.objects.create(
+            teacher=cls.teacher, title="Course", description="", is_published=True
+        )
+        Lesson.objects.create(course=cls.course, title="Lesson", video_url="https://example.com/1")
+        CourseReview.objects.create(learner=cls.learner, course=cls.course, rating=5)
+
+    def test_relations_default_to_ids(self):
+        (review,) = self.client.get("/v1/course-reviews/").data["results"]
+        self.assertEqual(review["course"], self.course.id)
+        self.assertEqual(review["learner"], self.learner.id)
+
+    def test_fields_and_expand(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(
+                "/v1/course-reviews/?fields=id,course.title,course.lessons.title"
+                "&expand=course.lessons"
+            )
+        (review,) = response.data["results"]
+        self.assertEqual(
+            review, {"id": review["id"], "course": {"title": "Course", "lessons": [{"title": "Lesson"}]}}
+        )
+        # The review joined to its course, then one query for the lessons.
+        self.assertEqual(len(ctx.captured_queries), 2)
+
+    def test_expand_is_checked_and_capped(self):
+        url = f"/v1/courses/{self.course.id}/"
+        response = self.client.get(url, {"expand": "lessons.course"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["lessons"][0]["course"]["id"], self.course.id)
+
+        too_deep = ("lessons.course.lessons", "lessons.course.lessons.course.lessons")
+        for expand in (*too_deep, "nope", "lessons.nope"):
+            with self.subTest(expand=expand):
+                response = self.client.get(url, {"expand": expand})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("expand", response.data)
+        self.assertEqual(self.client.get("/v1/course-reviews/?expand=rating").status_code, 400)
+
+    def test_writes_validate_every_field(self):
+        """?fields= and ?expand= shape the response, never the input."""
+        self.client.force_authenticate(self.teacher)
+        body = {"course": self.course.id, "title": "New", "video_url": "https://example.com/2"}
+        response = self.client.post("/v1/lessons/?fields=id,title", body)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(set(response.data), {"id", "title"})
+
+        response = self.client.post("/v1/lessons/?expand=course", {**body, "title": "Expanded"})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["course"]["title"], "Course")
+
+        response = self.client.patch(
+            f"/v1/lessons/{response.data['id']}/?fields=title&expand=course",
+            {"course": self.course.id, "title": "Renamed"},
+        )
+        self.assertEqual(response.data, {"title": "Renamed"})
+
+
+class CounterTests(APITestCase):
+    """The denormalized rating and enrollment counters follow every write path."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = User.objects.create_user("teacher@example.com", "password", role=User.Role.TEACHER)
+        cls.learner = User.objects.create_user("learner@example.com", "password", role=User.Role.LEARNER)
+        cls.course = Course.objects.create(
+            teacher=cls.teacher, title="Course", description="", price=10, is_published=True
+        )
+        cls.enrollment = Enrollment.objects.create(
+            learner=cls.learner, course=cls.course, status=Enrollment.Status.ACTIVE
+        )
+        recompute_counters()
+
+    def setUp(self):
+        self.client.force_authenticate(self.learner)
+
+    def counters(self, obj):
+        obj.refresh_from_db()
+        return obj.rating_sum, obj.rating_count
+
+    def test_course_review_create_update_delete(self):
+        response = self.client.post("/v1/course-reviews/", {"course_id": self.course.id, "rating": 4})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.counters(self.course), (4, 1))
+
+        url = f"/v1/course-reviews/{response.data['id']}/"
+        self.client.patch(url, {"rating": 2})
+        self.assertEqual(self.counters(self.course), (2, 1))
+        self.assertEqual(self.course.average_rating, 2)
+
+        self.client.delete(url)
+        self.assertEqual(self.counters(self.course), (0, 0))
+
+    def test_teacher_review_create_update_delete(self):
+        response = self.client.post("/v1/teacher-reviews/", {"teacher_id": self.teacher.id, "rating": 5})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.counters(self.teacher), (5, 1))
+
+        url = f"/v1/teacher-reviews/{response.data['id']}/"
+        self.client.patch(url, {"rating": 3})
+        self.assertEqual(self.counters(self.teacher), (3, 1))
+
+        self.client.delete(url)
+        self.assertEqual(self.counters(self.teacher), (0, 0))
+
+    def test_cancel_only_counts_active_enrollments_once(self):
+        url = f"/v1/enrollments/{self.enrollment.id}/cancel/"
+        self.assertEqual(self.client.post(url).status_code, 200)
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.active_enrollment_count, 0)
+
+        # Cancelling again doesn't decrement a second time.
+        Course.objects.filter(pk=self.course.pk).update(active_enrollment_count=3)
+        self.client.post(url)
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.active_enrollment_count, 3)
+
+    def test_payment_activates_and_recounts(self):
+        other = User.objects.create_user("other@example.com", "password", role=User.Role.LEARNER)
+        Enrollment.objects.create(learner=other, course=self.course, status=Enrollment.Status.PENDING)
+        self.client.force_authenticate(other)
+        response = self.client.post("/v1/payments/", {"course_id": self.course.id, "amount": "10"})
+        self.assertEqual(response.status_code, 201)
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.active_enrollment_count, 2)
+
+        # Paying again for an enrollment that is already active changes nothing.
+        self.client.post("/v1/payments/", {"course_id": self.course.id, "amount": "10"})
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.active_enrollment_count, 2)
+
+    def test_counters_never_go_below_zero(self):
+        # A counter that drifted low is clamped rather than violating the unsigned column.
+        Course.objects.filter(pk=self.course.pk).update(active_enrollment_count=0)
+        self.client.post(f"/v1/enrollments/{self.enrollment.id}/cancel/")
+        adjust_course_rating(self.course.id, -5, -1)
+        adjust_teacher_rating(self.teacher.id, -5, -1)
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.active_enrollment_count, 0)
+        self.assertEqual(self.counters(self.course), (0, 0))
+        self.assertEqual(self.counters(self.teacher), (0, 0))
+
+        # recompute_counters() repairs the drift from the source rows.
+        Enrollment.objects.filter(pk=self.enrollment.pk).update(status=Enrollment.Status.ACTIVE)
+        recompute_counters()
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.active_enrollment_count, 1)
+
+
+class CatalogCacheTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        teacher = User.objects.create_user("teacher@example.com", "password", role=User.Role.TEACHER)
+        Course.objects.bulk_create(
+            [
+                Course(teacher=teacher, title=f"Course {i}", description="", is_published=True)
+                for i in range(11)
+            ]
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.client.get("/v1/courses/")["ETag"]
+        for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+            with self.subTest(header=header):
+                response = self.client.get("/v1/courses/", headers={"If-None-Match": header})
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response["ETag"], etag)
+        # A tag that merely contains the current one is a different tag.
+        response = self.client.get("/v1/courses/", headers={"If-None-Match": f'"x{etag[1:]}'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_invalidate_catalog_drops_cached_responses(self):
+        self.client.get("/v1/courses/")
+        with self.assertNumQueries(0):
+            self.client.get("/v1/courses/")
+
+        Course.objects.update(title="Renamed")
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_catalog()
+        response = self.client.get("/v1/courses/")
+        self.assertEqual({course["title"] for course in response.data["results"]}, {"Renamed"})
+
+    @override_settings(ALLOWED_HOSTS=["a.example.com", "b.example.com"])
+    def test_cached_pagination_links_use_the_requesting_host(self):
+        first = self.client.get("/v1/courses/", HTTP_HOST="a.example.com")
+        cached = self.client.get("/v1/courses/", HTTP_HOST="b.example.com")
+        self.assertEqual(first.data["next"], "http://a.example.com/v1/courses/?page=2")
+        self.assertEqual(cached.data["next"], "http://b.example.com/v1/courses/?page=2")
+        self.assertEqual(cached["ETag"], first["ETag"])
+
+
+class BulkEndpointTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = User.objects.create_user("teacher@example.com", "password", role=User.Role.TEACHER)
+        cls.other_teacher = User.objects.create_user("other@example.com", "password", role=User.Role.TEACHER)
+        cls.learners = [
+            User.objects.create_user(f"learner{i}@example.com", "password", role=User.Role.LEARNER)
+            for i in range(3)
+        ]
+        cls.course = Course.objects.create(teacher=cls.teacher, title="Course", description="")
+        Lesson.objects.create(
+            course=cls.course, title="Intro", video_url="https://example.com/0", position=1
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.teacher)
+
+    def item(self, title, **extra):
+        return {"title": title, "video_url": f"https://example.com/{title}", **extra}
+
+    def test_bulk_lessons_insert_and_renumber(self):
+        response = self.client.post(
+            "/v1/lessons/bulk/",
+            {"course": self.course.id, "lessons": [self.item("first", position=1), self.item("last")]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            list(self.course.lessons.order_by("position").values_list("title", flat=True)),
+            ["first", "Intro", "last"],
+        )
+
+    def test_bulk_lessons_only_in_own_courses(self):
+        self.client.force_authenticate(self.other_teacher)
+        response = self.client.post(
+            "/v1/lessons/bulk/", {"course": self.course.id, "lessons": [self.item("x")]}, format="json"
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.course.lessons.count(), 1)
+
+    def test_one_invalid_lesson_rejects_the_batch(self):
+        response = self.client.post(
+            "/v1/lessons/bulk/",
+            {
+                "course": self.course.id,
+                "lessons": [self.item("ok"), {"title": "broken", "video_url": "not a url"}],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        # Errors are reported per item, in request order.
+        self.assertEqual(response.data["lessons"][0], {})
+        self.assertIn("video_url", response.data["lessons"][1])
+        self.assertEqual(self.course.lessons.count(), 1)
+
+    def test_bulk_enrollment_upserts_existing_enrollments(self):
+        first, second, third = self.learners
+        existing = Enrollment.objects.create(
+            learner=first, course=self.course, status=Enrollment.Status.PENDING
+        )
+        response = self.client.post(
+            "/v1/enrollments/bulk/",
+            {"course_id": self.course.id, "learner_ids": [first.id, second.id, second.id]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data["enrollments"]), 2)
+        existing.refresh_from_db()
+        self.assertEqual(existing.status, Enrollment.Status.ACTIVE)
+        self.assertEqual(
+            set(self.course.enrollments.values_list("learner_id", "status")),
+            {(first.id, Enrollment.Status.ACTIVE), (second.id, Enrollment.Status.ACTIVE)},
+        )
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.active_enrollment_count, 2)
+
+        # Repeating the request changes nothing.
+        self.client.post(
+            "/v1/enrollments/bulk/",
+            {"course_id": self.course.id, "learner_ids": [first.id, second.id]},
+            format="json",
+        )
+        self.assertEqual(self.course.enrollments.count(), 2)
+
+    def test_bulk_enrollment_validation(self):
+        body = {"course_id": self.course.id, "learner_ids": [self.learners[0].id, self.other_teacher.id]}
+        response = self.client.post("/v1/enrollments/bulk/", body, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(str(self.other_teacher.id), str(response.data["learner_ids"]))
+
+        self.client.force_authenticate(self.other_teacher)
+        body["learner_ids"] = [self.learners[0].id]
+        self.assertEqual(self.client.post("/v1/enrollments/bulk/", body, format="json").status_code, 403)
+        self.assertFalse(Enrollment.objects.exists())
+
+
+class CourseSearchTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = User.objects.create_user(
+            "teacher@example.com", "password", role=User.Role.TEACHER, first_name="Ada", last_name="Byron"
+        )
+        other = User.objects.create_user("other@example.com", "password", role=User.Role.TEACHER)
+        cls.python = Course.objects.create(
+            teacher=cls.teacher, title="Python for everyone", description="Programming", is_published=True
+        )
+        cls.cooking = Course.objects.create(
+            teacher=other, title="Cooking", description="Kitchen basics", is_published=True
+        )
+        Lesson.objects.create(course=cls.cooking, title="Python snacks", video_url="https://example.com/1")
+        cls.draft = Course.objects.create(teacher=cls.teacher, title="Python drafts", description="")
+        Course.objects.create(teacher=other, title="Python secrets", description="")
+
+    def setUp(self):
+        get_backend().rebuild()
+
+    def search(self, q, user=None):
+        self.client.force_authenticate(user)
+        response = self.client.get("/v1/courses/search/", {"q": q})
+        self.assertEqual(response.status_code, 200)
+        return [course["id"] for course in response.data["results"]]
+
+    def test_ranks_title_matches_first_and_hides_drafts(self):
+        self.assertEqual(self.search("python"), [self.python.id, self.cooking.id])
+        # Teachers also find their own drafts, never anyone else's.
+        self.assertEqual(
+            set(self.search("python", self.teacher)), {self.python.id, self.cooking.id, self.draft.id}
+        )
+
+    def test_matches_descriptions_lessons_and_teacher_names(self):
+        self.assertEqual(self.search("kitchen"), [self.cooking.id])
+        self.assertEqual(self.search("snacks"), [self.cooking.id])
+        self.assertEqual(self.search("byron"), [self.python.id])
+
+    @skipUnless(connection.vendor == "sqlite", "Prefix matching is specific to the FTS5 backend.")
+    def test_last_word_matches_as_a_prefix(self):
+        self.assertEqual(self.search("everyone pyth"), [self.python.id])
+        # Only the last word; the others must match whole.
+        self.assertEqual(self.search("pyth every"), [])
+
+    def test_search_syntax_in_q_is_treated_as_words(self):
+        for q in ('python" OR cooking', "NEAR(python cooking)", "title:cooking", "python AND", '"*'):
+            with self.subTest(q=q):
+                self.search(q)
+
+    def test_q_is_required(self):
+        for params in ({}, {"q": ""}, {"q": "   "}):
+            with self.subTest(params=params):
+                response = self.client.get("/v1/courses/search/", params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("q", response.data)
+
+    def test_edits_reindex_the_course(self):
+        self.client.force_authenticate(self.teacher)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f"/v1/courses/{self.python.id}/", {"title": "Snakes"})
+            self.client.post(
+                "/v1/lessons/",
+                {"course": self.python.id, "title": "Quantum loops", "video_url": "https://example.com/2"},
+            )
+            self.client.patch("/v1/users/profile/", {"last_name": "Lovelace"})
+        self.assertEqual(self.search("snakes"), [self.python.id])
+        self.assertEqual(self.search("quantum"), [self.python.id])
+        self.assertEqual(self.search("lovelace"), [self.python.id])
+        self.assertEqual(self.search("byron"), [])
+
+    def test_publish_and_unpublish_reindex(self):
+        course = Course.objects.create(teacher=self.teacher, title="Astronomy", description="")
+        self.client.force_authenticate(self.teacher)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"/v1/courses/{course.id}/publish/")
+        self.assertEqual(self.search("astronomy"), [course.id])
+
+        self.client.force_authenticate(self.teacher)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"/v1/courses/{course.id}/unpublish/")
+        self.assertEqual(self.search("astronomy"), [])
+        self.assertEqual(self.search("astronomy", self.teacher), [course.id])
+
+    def test_rebuild_indexes_every_course(self):
+        course = Course.objects.create(teacher=self.teacher, title="Geology", is_published=True)
+        self.assertEqual(self.search("geology"), [])
+        self.assertEqual(get_backend().rebuild(), Course.objects.count())
+        self.assertEqual(self.search("geology"), [course.id])
@@ -1,5 +1,13 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
+from .async_views import (
+    AsyncCourseListView,
+    AsyncCourseDetailView,
+    AsyncLessonListView,
+    AsyncCourseReviewListView,
+    AsyncTeacherReviewListView,
+)
 from .views import (
     CourseViewSet,
     LessonViewSet,
@@ -15,4 +23,18 @@ router.register(r"enrollments", EnrollmentViewSet, basename="enrollment")
 router.register(r"course-reviews", CourseReviewViewSet, basename="course-review")
 router.register(r"teacher-reviews", TeacherReviewViewSet, basename="teacher-review")
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    path("async/courses/", AsyncCourseListView.as_view(), name="async-course-list"),
+    path("async/courses/<pk>/", AsyncCourseDetailView.as_view(), name="async-course-detail"),
+    path("async/lessons/", AsyncLessonListView.as_view(), name="async-lesson-list"),
+    path(
+        "async/course-reviews/",
+        AsyncCourseReviewListView.as_view(),
+        name="async-course-review-list",
+    ),
+    path(
+        "async/teacher-reviews/",
+        AsyncTeacherReviewListView.as_view(),
+        name="async-teacher-review-list",
+    ),
+]
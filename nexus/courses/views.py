@@ -1,14 +1,32 @@
-from django.db.models import Q
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
 from rest_framework import permissions, viewsets, status
 from rest_framework.decorators import action
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.response import Response
-from drf_yasg.utils import swagger_auto_schema
 
+from nexus.exports import EXPORT_RENDERERS, export_response
+from nexus.fieldsets import load_rendered_relations
+from nexus.pagination import CreatedAtCursorPagination
+from nexus.replicas import ReplicaReadMixin
+from notifications.models import OutboxMessage
+from notifications.outbox import enqueue_notifications
 from users.permissions import IsTeacher, IsLearner
+from .cache import CatalogCacheMixin, invalidate_catalog
+from .search import get_backend, reindex_courses
+from .counters import (
+    adjust_active_enrollments,
+    adjust_course_rating,
+    adjust_teacher_rating,
+    refresh_active_enrollments,
+)
 from .models import Course, Lesson, Enrollment, CourseReview, TeacherReview
 from .serializers import (
+    BulkEnrollmentSerializer,
+    BulkLessonSerializer,
     CourseSerializer,
+    CourseSummarySerializer,
     LessonSerializer,
     EnrollmentSerializer,
     CourseReviewSerializer,
@@ -16,15 +34,34 @@ from .serializers import (
 )
 
 
-class CourseViewSet(viewsets.ModelViewSet):
+class CourseViewSet(ReplicaReadMixin, CatalogCacheMixin, viewsets.ModelViewSet):
     swagger_tags = ["Courses"]
     serializer_class = CourseSerializer
 
+    def use_summary(self):
+        """
+        Lists and searches render the compact summary unless `?view=full` is
+        given; any read can opt into it with `?view=summary`.
+        """
+        view = self.request.query_params.get("view")
+        if self.action in ["list", "search"]:
+            return view != "full"
+        return self.action == "retrieve" and view == "summary"
+
+    def get_serializer_class(self):
+        if self.use_summary():
+            return CourseSummarySerializer
+        return CourseSerializer
+
     def get_queryset(self):
         user = self.request.user
-        qs = Course.objects.select_related("teacher").prefetch_related("lessons")
+        serializer = self.get_serializer()
+        qs = load_rendered_relations(Course.objects.all(), serializer)
+        if "lesson_count" in serializer.rendered_fields:
+            # Meta.ordering is dropped from GROUP BY queries, so restate it.
+            qs = qs.annotate(lesson_count=Count("lessons")).order_by(*Course._meta.ordering)
 
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "search"]:
             if user.is_authenticated and getattr(user, "role", None) == "TEACHER":
                 return qs.filter(Q(is_published=True) | Q(teacher=user)).distinct()
             return qs.filter(is_published=True)
@@ -34,18 +71,46 @@ class CourseViewSet(viewsets.ModelViewSet):
         return qs.none()
 
     def get_permissions(self):
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "search"]:
             return [permissions.AllowAny()]
         return [permissions.IsAuthenticated(), IsTeacher()]
 
     def perform_create(self, serializer):
-        serializer.save(teacher=self.request.user)
+        course = serializer.save(teacher=self.request.user)
+        invalidate_catalog()
+        reindex_courses([course.id])
+
+    def perform_update(self, serializer):
+        course = serializer.save()
+        invalidate_catalog()
+        reindex_courses([course.id])
+
+    def perform_destroy(self, instance):
+        course_id = instance.id
+        instance.delete()
+        invalidate_catalog()
+        reindex_courses([course_id])
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """Ranked full-text search over titles, descriptions, lesson titles and teacher names."""
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": "This query parameter is required."})
+        ranked = get_backend().search(query, settings.COURSE_SEARCH_MAX_RESULTS)
+        visible = set(self.get_queryset().filter(id__in=ranked).values_list("id", flat=True))
+        page = self.paginate_queryset([pk for pk in ranked if pk in visible])
+        courses = self.get_queryset().in_bulk(page)
+        serializer = self.get_serializer([courses[pk] for pk in page], many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated, IsTeacher])
     def publish(self, request, pk=None):
         course = self.get_object()
         course.is_published = True
         course.save(update_fields=["is_published", "updated_at"])
+        invalidate_catalog()
+        reindex_courses([course.id])
         return Response({"detail": "Course published"}, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated, IsTeacher])
@@ -53,15 +118,17 @@ class CourseViewSet(viewsets.ModelViewSet):
         course = self.get_object()
         course.is_published = False
         course.save(update_fields=["is_published", "updated_at"])
+        invalidate_catalog()
+        reindex_courses([course.id])
         return Response({"detail": "Course unpublished"}, status=status.HTTP_200_OK)
 
 
-class LessonViewSet(viewsets.ModelViewSet):
+class LessonViewSet(ReplicaReadMixin, CatalogCacheMixin, viewsets.ModelViewSet):
     swagger_tags = ["Lessons"]
     serializer_class = LessonSerializer
 
     def get_queryset(self):
-        qs = Lesson.objects.select_related("course", "course__teacher")
+        qs = load_rendered_relations(Lesson.objects.all(), self.get_serializer())
         course_id = self.request.query_params.get("course")
         if course_id:
             qs = qs.filter(course_id=course_id)
@@ -78,26 +145,78 @@ class LessonViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         course = serializer.validated_data["course"]
-        if course.teacher != self.request.user:
+        if course.teacher_id != self.request.user.id:
             raise PermissionDenied("You can only add lessons to your own courses.")
         serializer.save()
+        invalidate_catalog()
+        reindex_courses([course.id])
 
     def perform_update(self, serializer):
         course = serializer.instance.course
-        if course.teacher != self.request.user:
+        if course.teacher_id != self.request.user.id:
             raise PermissionDenied("You can only update lessons in your own courses.")
-        serializer.save()
+        lesson = serializer.save()
+        invalidate_catalog()
+        reindex_courses({course.id, lesson.course_id})
 
+    def perform_destroy(self, instance):
+        instance.delete()
+        invalidate_catalog()
+        reindex_courses([instance.course_id])
 
-class EnrollmentViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=["post"], serializer_class=BulkLessonSerializer)
+    def bulk(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        course = serializer.validated_data["course"]
+        items = serializer.validated_data["lessons"]
+
+        with transaction.atomic():
+            ordered = list(
+                Lesson.objects.select_for_update()
+                .filter(course=course)
+                .order_by("position", "created_at")
+                .only("id", "position")
+            )
+            previous = {lesson.id: lesson.position for lesson in ordered}
+            new = [
+                Lesson(course=course, title=item["title"], video_url=item["video_url"])
+                for item in items
+            ]
+            requested = sorted(
+                ((item["position"], lesson) for item, lesson in zip(items, new) if "position" in item),
+                key=lambda pair: pair[0],
+            )
+            for position, lesson in requested:
+                ordered.insert(position - 1, lesson)
+            ordered.extend(lesson for item, lesson in zip(items, new) if "position" not in item)
+
+            # Renumber the whole curriculum in one pass.
+            for position, lesson in enumerate(ordered, start=1):
+                lesson.position = position
+            moved = [
+                lesson
+                for lesson in ordered
+                if lesson.id is not None and previous[lesson.id] != lesson.position
+            ]
+            Lesson.objects.bulk_update(moved, ["position"])
+            created = Lesson.objects.bulk_create(new)
+            invalidate_catalog()
+            reindex_courses([course.id])
+
+        return Response(LessonSerializer(created, many=True).data, status=status.HTTP_201_CREATED)
+
+
+class EnrollmentViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     swagger_tags = ["Enrollments"]
     serializer_class = EnrollmentSerializer
+    pagination_class = CreatedAtCursorPagination
     permission_classes = [permissions.IsAuthenticated]
     http_method_names = ["get", "post", "patch", "head", "options"]
 
     def get_queryset(self):
         user = self.request.user
-        qs = Enrollment.objects.select_related("course", "course__teacher", "learner")
+        qs = load_rendered_relations(Enrollment.objects.all(), self.get_serializer())
         if getattr(user, "role", None) == "TEACHER":
             return qs.filter(course__teacher=user)
         return qs.filter(learner=user)
@@ -107,37 +226,97 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("Only learners can enroll in courses.")
         return super().create(request, *args, **kwargs)
 
+    @transaction.atomic
     def perform_create(self, serializer):
         enrollment = serializer.save(learner=self.request.user, status=Enrollment.Status.PENDING)
-        try:
-            from notifications.tasks import send_enrollment_notification
-
-            send_enrollment_notification.delay(enrollment.id)
-        except Exception:
-            pass
+        enqueue_notifications([(OutboxMessage.Kind.ENROLLMENT, enrollment.id)])
+
+    @action(detail=False, methods=["get"], renderer_classes=EXPORT_RENDERERS)
+    def export(self, request):
+        """Stream every visible enrollment as CSV or NDJSON, optionally for one `?course=`."""
+        queryset = self.get_queryset().order_by("-created_at", "-id")
+        course = request.query_params.get("course")
+        if course is not None:
+            if not course.isdigit():
+                raise ValidationError({"course": "Must be a course id."})
+            queryset = queryset.filter(course_id=course)
+        return export_response(
+            request,
+            queryset,
+            {
+                "id": "id",
+                "created_at": "created_at",
+                "updated_at": "updated_at",
+                "status": "status",
+                "progress": "progress",
+                "course_id": "course_id",
+                "course_title": "course__title",
+                "learner_id": "learner_id",
+                "learner_email": "learner__email",
+            },
+            "enrollments",
+        )
+
+    @action(
+        detail=False,
+        methods=["post"],
+        serializer_class=BulkEnrollmentSerializer,
+        permission_classes=[permissions.IsAuthenticated, IsTeacher],
+    )
+    def bulk(self, request):
+        """Enroll a cohort of learners into one of the teacher's courses as ACTIVE."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        course = serializer.validated_data["course"]
+        learner_ids = serializer.validated_data["learner_ids"]
+
+        with transaction.atomic():
+            enrollments = Enrollment.objects.bulk_create(
+                [
+                    Enrollment(learner_id=learner_id, course=course, status=Enrollment.Status.ACTIVE)
+                    for learner_id in learner_ids
+                ],
+                update_conflicts=True,
+                unique_fields=["learner", "course"],
+                update_fields=["status", "updated_at"],
+            )
+            refresh_active_enrollments(course.id)
+            enqueue_notifications(
+                [(OutboxMessage.Kind.ENROLLMENT, enrollment.id) for enrollment in enrollments]
+            )
+
+        return Response(
+            {
+                "course_id": course.id,
+                "enrollments": [
+                    {"id": e.id, "learner_id": e.learner_id, "status": e.status} for e in enrollments
+                ],
+            },
+            status=status.HTTP_201_CREATED,
+        )
 
     @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
     def cancel(self, request, pk=None):
         enrollment = self.get_object()
         user = request.user
-        if user != enrollment.learner and not (
-            getattr(user, "role", None) == "TEACHER" and enrollment.course.teacher == user
+        if enrollment.learner_id != user.id and not (
+            getattr(user, "role", None) == "TEACHER" and enrollment.course.teacher_id == user.id
         ):
             raise PermissionDenied("You cannot cancel this enrollment.")
-        enrollment.status = Enrollment.Status.CANCELLED
-        enrollment.save(update_fields=["status", "updated_at"])
-        try:
-            from notifications.tasks import send_enrollment_notification
-
-            send_enrollment_notification.delay(enrollment.id)
-        except Exception:
-            pass
+        with transaction.atomic():
+            was_active = enrollment.status == Enrollment.Status.ACTIVE
+            enrollment.status = Enrollment.Status.CANCELLED
+            enrollment.save(update_fields=["status", "updated_at"])
+            if was_active:
+                adjust_active_enrollments(enrollment.course_id, -1)
+            enqueue_notifications([(OutboxMessage.Kind.ENROLLMENT, enrollment.id)])
         return Response({"detail": "Enrollment cancelled."}, status=status.HTTP_200_OK)
 
 
-class CourseReviewViewSet(viewsets.ModelViewSet):
+class CourseReviewViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     swagger_tags = ["Course Reviews"]
     serializer_class = CourseReviewSerializer
+    pagination_class = CreatedAtCursorPagination
     http_method_names = ["get", "post", "patch", "delete", "head", "options"]
 
     def get_permissions(self):
@@ -146,7 +325,7 @@ class CourseReviewViewSet(viewsets.ModelViewSet):
         return [permissions.IsAuthenticated(), IsLearner()]
 
     def get_queryset(self):
-        qs = CourseReview.objects.select_related("course", "learner", "course__teacher")
+        qs = load_rendered_relations(CourseReview.objects.all(), self.get_serializer())
         course_id = self.request.query_params.get("course")
         teacher_id = self.request.query_params.get("teacher")
         if course_id:
@@ -155,23 +334,35 @@ class CourseReviewViewSet(viewsets.ModelViewSet):
             qs = qs.filter(course__teacher_id=teacher_id)
         return qs
 
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save(learner=self.request.user)
+        review = serializer.save(learner=self.request.user)
+        adjust_course_rating(review.course_id, review.rating, 1)
 
+    @transaction.atomic
     def perform_update(self, serializer):
-        if serializer.instance.learner != self.request.user:
+        if serializer.instance.learner_id != self.request.user.id:
             raise PermissionDenied("You can only edit your own review.")
-        serializer.save()
-
+        old_course_id, old_rating = serializer.instance.course_id, serializer.instance.rating
+        review = serializer.save()
+        if review.course_id != old_course_id:
+            adjust_course_rating(old_course_id, -old_rating, -1)
+            adjust_course_rating(review.course_id, review.rating, 1)
+        elif review.rating != old_rating:
+            adjust_course_rating(review.course_id, review.rating - old_rating)
+
+    @transaction.atomic
     def perform_destroy(self, instance):
-        if instance.learner != self.request.user:
+        if instance.learner_id != self.request.user.id:
             raise PermissionDenied("You can only delete your own review.")
+        adjust_course_rating(instance.course_id, -instance.rating, -1)
         instance.delete()
 
 
-class TeacherReviewViewSet(viewsets.ModelViewSet):
+class TeacherReviewViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     swagger_tags = ["Teacher Reviews"]
     serializer_class = TeacherReviewSerializer
+    pagination_class = CreatedAtCursorPagination
     http_method_names = ["get", "post", "patch", "delete", "head", "options"]
 
     def get_permissions(self):
@@ -180,21 +371,32 @@ class TeacherReviewViewSet(viewsets.ModelViewSet):
         return [permissions.IsAuthenticated(), IsLearner()]
 
     def get_queryset(self):
-        qs = TeacherReview.objects.select_related("teacher", "learner")
+        qs = load_rendered_relations(TeacherReview.objects.all(), self.get_serializer())
         teacher_id = self.request.query_params.get("teacher")
         if teacher_id:
             qs = qs.filter(teacher_id=teacher_id)
         return qs
 
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save(learner=self.request.user)
+        review = serializer.save(learner=self.request.user)
+        adjust_teacher_rating(review.teacher_id, review.rating, 1)
 
+    @transaction.atomic
     def perform_update(self, serializer):
-        if serializer.instance.learner != self.request.user:
+        if serializer.instance.learner_id != self.request.user.id:
             raise PermissionDenied("You can only edit your own review.")
-        serializer.save()
-
+        old_teacher_id, old_rating = serializer.instance.teacher_id, serializer.instance.rating
+        review = serializer.save()
+        if review.teacher_id != old_teacher_id:
+            adjust_teacher_rating(old_teacher_id, -old_rating, -1)
+            adjust_teacher_rating(review.teacher_id, review.rating, 1)
+        elif review.rating != old_rating:
+            adjust_teacher_rating(review.teacher_id, review.rating - old_rating)
+
+    @transaction.atomic
     def perform_destroy(self, instance):
-        if instance.learner != self.request.user:
+        if instance.learner_id != self.request.user.id:
             raise PermissionDenied("You can only delete your own review.")
+        adjust_teacher_rating(instance.teacher_id, -instance.rating, -1)
         instance.delete()
@@ -1,3 +1,14 @@
-from .celery import app as celery_app
+# The Celery app is loaded on first use rather than with every process:
+# `celery -A nexus` finds it through nexus.celery, and the only code that
+# sends tasks (notifications.outbox.relay_outbox) imports it explicitly.
+
+
+def __getattr__(name):
+    if name == "celery_app":
+        from .celery import app
+
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ("celery_app",)
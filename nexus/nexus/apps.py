@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class NexusConfig(AppConfig):
+    """Project-wide tooling: the management commands for nexus.schema and nexus.importtime."""
+
+    name = 'nexus'
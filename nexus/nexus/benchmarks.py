@@ -0,0 +1,425 @@
+"""
+API benchmark harness: seeds a scaled-up version of the seed_demo dataset,
+hits every router endpoint as each role and records query counts and
+p50/p95 latency, then compares them against a committed baseline. Process
+boot time for web and worker processes (see nexus.importtime) is tracked
+the same way, as the `boot:<target>` entries.
+
+Used by nexus/tests.py, which skips the timed runs unless BENCHMARK=1 (or
+BENCHMARK_UPDATE_BASELINE=1) is set; the knobs are environment variables:
+
+    BENCHMARK                  set to 1 to run the benchmarks
+    BENCHMARK_REPORT           file the latency and throughput reports are appended to
+    BENCHMARK_SCALE            dataset multiplier (default 1)
+    BENCHMARK_ITERATIONS       requests per endpoint and role (default 10)
+    BENCHMARK_LATENCY_FACTOR   allowed p50/p95 slowdown vs. baseline (default 3)
+    BENCHMARK_LATENCY_SLACK_MS absolute headroom added on top (default 25)
+    BENCHMARK_UPDATE_BASELINE  set to 1 to rewrite the baseline file
+    BENCHMARK_CONCURRENCY      requests in flight for the ASGI throughput runs (default 10)
+    BENCHMARK_BOOT_RUNS        fresh processes started per boot target (default 3)
+"""
+
+import asyncio
+import gc
+import json
+import math
+import os
+import random
+import statistics
+import time
+from decimal import Decimal
+from itertools import count
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from analytics.rollups import rebuild_rollups
+from nexus import importtime
+from courses.counters import recompute_counters
+from courses.models import Course, Lesson, Enrollment, CourseReview, TeacherReview
+from courses.search import get_backend
+from payments.models import Payment
+from users.models import User
+
+BASELINE_PATH = Path(__file__).with_name("benchmark_baseline.json")
+PASSWORD = "password"
+
+ANON, LEARNER, TEACHER = "anon", "learner", "teacher"
+EVERYONE = (ANON, LEARNER, TEACHER)
+MEMBERS = (LEARNER, TEACHER)
+# A Prometheus scraper; run the benchmarks with METRICS_TOKEN=SCRAPER_TOKEN.
+SCRAPER, SCRAPER_TOKEN = "scraper", "benchmark-scrape"
+
+_unique = count()
+
+# (name, method, path template, roles, payload factory)
+ENDPOINTS = [
+    ("courses-list", "get", "/v1/courses/", EVERYONE, None),
+    ("courses-list-full", "get", "/v1/courses/?view=full", EVERYONE, None),
+    ("courses-detail", "get", "/v1/courses/{course}/", EVERYONE, None),
+    ("courses-search", "get", "/v1/courses/search/?q=lesson course", EVERYONE, None),
+    ("courses-publish", "post", "/v1/courses/{course}/publish/", (TEACHER,), None),
+    ("lessons-list", "get", "/v1/lessons/?course={course}", EVERYONE, None),
+    ("lessons-detail", "get", "/v1/lessons/{lesson}/", EVERYONE, None),
+    ("enrollments-list", "get", "/v1/enrollments/", MEMBERS, None),
+    ("enrollments-detail", "get", "/v1/enrollments/{enrollment}/", MEMBERS, None),
+    ("enrollments-export", "get", "/v1/enrollments/export/?format=csv", MEMBERS, None),
+    ("course-reviews-list", "get", "/v1/course-reviews/?course={course}", EVERYONE, None),
+    ("course-reviews-detail", "get", "/v1/course-reviews/{course_review}/", EVERYONE, None),
+    ("teacher-reviews-list", "get", "/v1/teacher-reviews/?teacher={teacher}", EVERYONE, None),
+    ("teacher-reviews-detail", "get", "/v1/teacher-reviews/{teacher_review}/", EVERYONE, None),
+    ("payments-list", "get", "/v1/payments/", MEMBERS, None),
+    ("payments-detail", "get", "/v1/payments/{payment}/", MEMBERS, None),
+    ("payments-export", "get", "/v1/payments/export/?format=csv", MEMBERS, None),
+    (
+        "payments-create",
+        "post",
+        "/v1/payments/",
+        (LEARNER,),
+        lambda ids: {"course_id": ids["course"], "amount": "10.00"},
+    ),
+    ("users-profile", "get", "/v1/users/profile/", MEMBERS, None),
+    (
+        "users-register",
+        "post",
+        "/v1/users/register/",
+        (ANON,),
+        lambda ids: {"email": f"bench{next(_unique)}@example.com", "password": "bench-password"},
+    ),
+    (
+        "users-login",
+        "post",
+        "/v1/users/login/",
+        (ANON,),
+        lambda ids: {"email": ids["learner_email"], "password": PASSWORD},
+    ),
+    ("analytics-teacher", "get", "/v1/analytics/teacher/", (TEACHER,), None),
+    ("health", "get", "/v1/health/", (ANON,), None),
+    ("health-live", "get", "/v1/health/live", (ANON,), None),
+    ("health-ready", "get", "/v1/health/ready", (ANON,), None),
+    ("metrics", "get", "/v1/metrics/", (SCRAPER,), None),
+]
+
+# (name, sync path, async path) for the catalog reads that have an async twin.
+ASYNC_PAIRS = [
+    ("courses-list", "/v1/courses/", "/v1/async/courses/"),
+    ("courses-list-full", "/v1/courses/?view=full", "/v1/async/courses/?view=full"),
+    ("courses-detail", "/v1/courses/{course}/", "/v1/async/courses/{course}/"),
+    ("lessons-list", "/v1/lessons/?course={course}", "/v1/async/lessons/?course={course}"),
+    (
+        "course-reviews-list",
+        "/v1/course-reviews/?course={course}",
+        "/v1/async/course-reviews/?course={course}",
+    ),
+    (
+        "teacher-reviews-list",
+        "/v1/teacher-reviews/?teacher={teacher}",
+        "/v1/async/teacher-reviews/?teacher={teacher}",
+    ),
+]
+
+
+def seed(scale=1, seed_value=0):
+    """
+    Bulk-create a dataset shaped like seed_demo but `scale` times larger and
+    return the ids the endpoint templates refer to.
+    """
+    rng = random.Random(seed_value)
+    password = make_password(PASSWORD)
+
+    teachers = User.objects.bulk_create(
+        [
+            User(
+                email=f"bench-teacher{i}@example.com",
+                role=User.Role.TEACHER,
+                password=password,
+                first_name="Teacher",
+                last_name=str(i),
+            )
+            for i in range(2 * scale)
+        ]
+    )
+    learners = User.objects.bulk_create(
+        [
+            User(
+                email=f"bench-learner{i}@example.com",
+                role=User.Role.LEARNER,
+                password=password,
+                first_name="Learner",
+                last_name=str(i),
+            )
+            for i in range(20 * scale)
+        ]
+    )
+    Token.objects.bulk_create(
+        [Token(user=user, key=Token.generate_key()) for user in teachers + learners]
+    )
+
+    courses = Course.objects.bulk_create(
+        [
+            Course(
+                teacher=teacher,
+                title=f"{teacher.last_name} course {n}",
+                description="Benchmark course",
+                price=Decimal("49.00"),
+                is_published=True,
+            )
+            for teacher in teachers
+            for n in range(5)
+        ]
+    )
+    lessons = Lesson.objects.bulk_create(
+        [
+            Lesson(
+                course=course,
+                title=f"Lesson {p}",
+                video_url=f"https://videos.example.com/{course.id}/{p}",
+                position=p,
+            )
+            for course in courses
+            for p in range(1, 51)
+        ]
+    )
+
+    enrollments, payments, course_reviews, teacher_reviews = [], [], [], []
+    for learner in learners:
+        picked = [courses[0]] + rng.sample(courses[1:], 4)
+        for course in picked:
+            enrollments.append(
+                Enrollment(learner=learner, course=course, status=Enrollment.Status.ACTIVE)
+            )
+            payments.append(
+                Payment(
+                    learner=learner,
+                    course=course,
+                    amount=course.price,
+                    status=Payment.Status.SUCCESS,
+                    reference=f"bench-{learner.id}-{course.id}",
+                )
+            )
+            course_reviews.append(
+                CourseReview(learner=learner, course=course, rating=rng.randint(1, 5))
+            )
+        for teacher_id in {course.teacher_id for course in picked}:
+            teacher_reviews.append(
+                TeacherReview(learner=learner, teacher_id=teacher_id, rating=rng.randint(1, 5))
+            )
+    Enrollment.objects.bulk_create(enrollments)
+    Payment.objects.bulk_create(payments)
+    CourseReview.objects.bulk_create(course_reviews)
+    TeacherReview.objects.bulk_create(teacher_reviews)
+    recompute_counters()
+    get_backend().rebuild()
+    with override_settings(ANALYTICS_ROLLUP_SETTLE=0):
+        rebuild_rollups()
+
+    teacher, learner, course = teachers[0], learners[0], courses[0]
+    return {
+        "teacher": teacher.id,
+        "learner": learner.id,
+        "learner_email": learner.email,
+        "course": course.id,
+        "lesson": lessons[0].id,
+        "enrollment": Enrollment.objects.get(learner=learner, course=course).id,
+        "payment": Payment.objects.get(learner=learner, course=course).id,
+        "course_review": CourseReview.objects.get(learner=learner, course=course).id,
+        "teacher_review": TeacherReview.objects.get(learner=learner, teacher=teacher).id,
+    }
+
+
+def client_for(role, ids):
+    client = APIClient()
+    if role == SCRAPER:
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {SCRAPER_TOKEN}")
+    elif role != ANON:
+        token = Token.objects.get(user_id=ids[role])
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return client
+
+
+def send(client, method, path, data=None):
+    response = getattr(client, method)(path, data, format="json")
+    if response.streaming:
+        # Streamed bodies query the database as they are consumed.
+        b"".join(response.streaming_content)
+    return response
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def run(ids, iterations=10):
+    """
+    Return {"<endpoint>:<role>": {"queries", "p50_ms", "p95_ms"}}. The cache is
+    cleared before every request so the uncached path is what gets measured.
+    Like timeit, each series starts with an untimed warm-up request and runs
+    with the garbage collector paused.
+    """
+    results = {}
+    for name, method, template, roles, payload in ENDPOINTS:
+        path = template.format(**ids)
+        for role in roles:
+            client = client_for(role, ids)
+            timings, queries = [], 0
+            gc.collect()
+            gc.disable()
+            try:
+                for i in range(iterations + 1):
+                    cache.clear()
+                    data = payload(ids) if payload else None
+                    with CaptureQueriesContext(connection) as ctx:
+                        start = time.perf_counter()
+                        response = send(client, method, path, data)
+                        elapsed = (time.perf_counter() - start) * 1000
+                    if response.status_code >= 400:
+                        raise AssertionError(f"{name} as {role} returned {response.status_code}")
+                    if i:
+                        timings.append(elapsed)
+                        queries = max(queries, len(ctx.captured_queries))
+            finally:
+                gc.enable()
+            results[f"{name}:{role}"] = {
+                "queries": queries,
+                "p50_ms": round(statistics.median(timings), 2),
+                "p95_ms": round(percentile(timings, 95), 2),
+            }
+    return results
+
+
+def boot(runs=3):
+    """{"boot:<target>": ...} for the time a fresh web or worker process takes to boot."""
+    results = {}
+    for target in importtime.TARGETS:
+        timings = [importtime.boot_seconds(target) * 1000 for _ in range(runs)]
+        results[f"boot:{target}"] = {
+            "queries": 0,
+            "p50_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(percentile(timings, 95), 2),
+        }
+    return results
+
+
+async def athroughput(ids, requests=50, concurrency=10):
+    """
+    Return {"<endpoint>": {"wsgi", "asgi_sync", "asgi_async"}} in requests/sec
+    for every ASYNC_PAIRS entry, served three ways:
+
+        wsgi        the sync view through the WSGI handler, one at a time
+        asgi_sync   the sync view through the ASGI handler
+        asgi_async  the async view through the ASGI handler
+
+    The ASGI runs keep `concurrency` requests in flight. The catalog cache is
+    disabled so every request reaches the database.
+    """
+
+    def wsgi(path):
+        client = Client()
+        start = time.perf_counter()
+        for _ in range(requests):
+            response = client.get(path)
+            if response.status_code >= 400:
+                raise AssertionError(f"{path} returned {response.status_code}")
+        return requests / (time.perf_counter() - start)
+
+    async def asgi(path):
+        client = AsyncClient()
+        slots = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with slots:
+                response = await client.get(path)
+            if response.status_code >= 400:
+                raise AssertionError(f"{path} returned {response.status_code}")
+
+        await one()  # warm-up
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return requests / (time.perf_counter() - start)
+
+    results = {}
+    with override_settings(CATALOG_CACHE_TIMEOUT=0):
+        for name, sync_template, async_template in ASYNC_PAIRS:
+            sync_path = sync_template.format(**ids)
+            results[name] = {
+                "wsgi": round(await sync_to_async(wsgi)(sync_path), 1),
+                "asgi_sync": round(await asgi(sync_path), 1),
+                "asgi_async": round(await asgi(async_template.format(**ids)), 1),
+            }
+    return results
+
+
+def throughput_report(results):
+    lines = [f"{'endpoint (req/s)':<24}{'wsgi':>10}{'asgi sync':>12}{'asgi async':>12}"]
+    for name, rates in results.items():
+        lines.append(
+            f"{name:<24}{rates['wsgi']:>10}{rates['asgi_sync']:>12}{rates['asgi_async']:>12}"
+        )
+    return "\n".join(lines)
+
+
+def compare(results, baseline, latency_factor=3.0, latency_slack_ms=25.0):
+    """
+    List every measurement that exceeds its baseline. Query counts must not
+    grow at all; latencies may grow by `latency_factor` plus a fixed slack so
+    scheduler noise on fast endpoints doesn't fail the run.
+    """
+    failures = []
+    for key, measured in sorted(results.items()):
+        expected = baseline.get(key)
+        if expected is None:
+            failures.append(f"{key}: no baseline entry")
+            continue
+        if measured["queries"] > expected["queries"]:
+            failures.append(f"{key}: {measured['queries']} queries, baseline {expected['queries']}")
+        for stat in ("p50_ms", "p95_ms"):
+            allowed = expected[stat] * latency_factor + latency_slack_ms
+            if measured[stat] > allowed:
+                failures.append(f"{key}: {stat} {measured[stat]}, allowed {allowed:.2f}")
+    return failures
+
+
+def report(results):
+    lines = [f"{'endpoint:role':<34}{'queries':>8}{'p50 ms':>10}{'p95 ms':>10}"]
+    for key, measured in sorted(results.items()):
+        lines.append(
+            f"{key:<34}{measured['queries']:>8}{measured['p50_ms']:>10}{measured['p95_ms']:>10}"
+        )
+    return "\n".join(lines)
+
+
+def write_report(path, text):
+    with open(path, "a") as report_file:
+        report_file.write(text + "\n\n")
+
+
+def load_baseline():
+    if not BASELINE_PATH.exists():
+        return None
+    return json.loads(BASELINE_PATH.read_text())
+
+
+def write_baseline(results):
+    BASELINE_PATH.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+
+def settings_from_env():
+    return {
+        "enabled": os.getenv("BENCHMARK") == "1" or os.getenv("BENCHMARK_UPDATE_BASELINE") == "1",
+        "report": os.getenv("BENCHMARK_REPORT"),
+        "scale": int(os.getenv("BENCHMARK_SCALE", "1")),
+        "iterations": int(os.getenv("BENCHMARK_ITERATIONS", "10")),
+        "latency_factor": float(os.getenv("BENCHMARK_LATENCY_FACTOR", "3")),
+        "latency_slack_ms": float(os.getenv("BENCHMARK_LATENCY_SLACK_MS", "25")),
+        "update_baseline": os.getenv("BENCHMARK_UPDATE_BASELINE") == "1",
+        "concurrency": int(os.getenv("BENCHMARK_CONCURRENCY", "10")),
+        "boot_runs": int(os.getenv("BENCHMARK_BOOT_RUNS", "3")),
+    }
@@ -2,7 +2,12 @@ import os
 from celery import Celery
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "nexus.settings")
+# Celery's Django fixup runs the system checks as a worker starts, and the
+# URL checks import every view, DRF's request stack and drf_yasg with them.
+# Workers never serve those; `manage.py check` covers them.
+os.environ.setdefault("CELERY_SKIP_CHECKS", "1")
 
 app = Celery("nexus")
 app.config_from_object("django.conf:settings", namespace="CELERY")
-app.autodiscover_tasks()
+# The apps that define tasks, rather than probing every installed app.
+app.autodiscover_tasks(["notifications", "analytics"])
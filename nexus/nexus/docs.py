@@ -0,0 +1,39 @@
+"""
+drf_yasg's swagger_auto_schema without importing drf_yasg.
+
+Views use these in place of drf_yasg.utils. The overrides are recorded and
+handed to drf_yasg's decorator by apply_overrides() when a schema is first
+generated (see nexus.schema), so only processes that build or serve the
+docs load drf_yasg.
+"""
+
+import threading
+
+_lock = threading.Lock()
+# (view, overrides) in the order the decorators ran
+_pending = []
+
+
+class no_body:
+    """Stands in for drf_yasg.utils.no_body."""
+
+
+def swagger_auto_schema(**overrides):
+    def decorator(view):
+        with _lock:
+            _pending.append((view, overrides))
+        return view
+
+    return decorator
+
+
+def apply_overrides():
+    """Apply the overrides recorded so far; later calls only apply new ones."""
+    from drf_yasg import utils
+
+    with _lock:
+        while _pending:
+            view, overrides = _pending.pop(0)
+            if overrides.get("request_body") is no_body:
+                overrides = {**overrides, "request_body": utils.no_body}
+            utils.swagger_auto_schema(**overrides)(view)
@@ -0,0 +1,203 @@
+"""
+Sparse fieldsets and relation expansion for ModelSerializers.
+
+    ?fields=id,rating,course.title    render only these fields
+    ?expand=course,course.teacher     render these relations as nested objects
+
+Relations named in a serializer's Meta.expandable_fields render as primary
+keys unless expanded. Dotted names reach into expanded relations, and
+expanding `course.teacher` expands `course` too, up to MAX_EXPAND_DEPTH
+levels; unknown or deeper names are a 400. Both only shape the output;
+input is validated against every field. load_rendered_relations() then
+fetches exactly the relations the serializer is going to render.
+"""
+
+from django.db.models import ManyToOneRel, Prefetch
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+from .profiling import current_profile, profile_section
+
+# Expansions cycle (a lesson's course, that course's lessons, ...), and each
+# level multiplies the response, so `a.b` is as deep as ?expand= goes.
+MAX_EXPAND_DEPTH = 2
+
+
+def _split(names):
+    """['a', 'b.c', 'b.d'] -> ({'a', 'b'}, {'b': ['c', 'd']})"""
+    top, nested = set(), {}
+    for name in names:
+        head, _, rest = name.partition(".")
+        top.add(head)
+        if rest:
+            nested.setdefault(head, []).append(rest)
+    return top, nested
+
+
+def _query_list(request, key):
+    return [
+        name.strip()
+        for value in request.query_params.getlist(key)
+        for name in value.split(",")
+        if name.strip()
+    ]
+
+
+def _expansions(serializer_class):
+    """{name: (serializer class, kwargs)} from Meta.expandable_fields."""
+    if not issubclass(serializer_class, SparseFieldsetMixin):
+        return {}
+    found = {}
+    for name, spec in getattr(serializer_class.Meta, "expandable_fields", {}).items():
+        target, options = spec if isinstance(spec, tuple) else (spec, {})
+        if isinstance(target, str):
+            target = import_string(target)
+        found[name] = (target, options)
+    return found
+
+
+def _check_expand(serializer_class, names):
+    errors = []
+    for name in names:
+        parts = name.split(".")
+        if len(parts) > MAX_EXPAND_DEPTH:
+            errors.append(f"{name}: expansions go at most {MAX_EXPAND_DEPTH} levels deep.")
+            continue
+        target = serializer_class
+        for part in parts:
+            expansions = _expansions(target)
+            if part not in expansions:
+                errors.append(f"{name}: {part} can't be expanded.")
+                break
+            target = expansions[part][0]
+    if errors:
+        raise ValidationError({"expand": errors})
+
+
+class SparseFieldsetMixin:
+    """
+    Meta.expandable_fields maps a relation to the serializer that renders it
+    when expanded, or to (serializer, kwargs) for e.g. many=True. Import
+    paths work too, for serializers defined later in the module. The
+    top-level serializer reads `fields` and `expand` from the request;
+    nested ones get their share from the parent.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        self._only = fields
+        self._expand = expand
+        super().__init__(*args, **kwargs)
+
+    def is_top_level(self):
+        """Whether this serializes the response itself, alone or as a list's child."""
+        if self._expand is not None:
+            return False
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def sparse_options(self):
+        """(field names or None for all, relations to expand)."""
+        if self._expand is not None:
+            return self._only, self._expand
+        request = self.context.get("request")
+        if request is None or not self.is_top_level():
+            return None, []
+        return _query_list(request, "fields") or None, _query_list(request, "expand")
+
+    def to_representation(self, instance):
+        if current_profile() is None or not self.is_top_level():
+            return super().to_representation(instance)
+        with profile_section("serializer"):
+            return super().to_representation(instance)
+
+    @cached_property
+    def rendered_fields(self):
+        """
+        The fields to_representation() renders: `fields` trimmed by ?fields=
+        and with ?expand= relations swapped for nested serializers. `fields`
+        itself stays whole, so validating input is unaffected by either.
+        """
+        fields = dict(self.fields)
+        only, expand = self.sparse_options()
+        if self._expand is None:
+            # Nested serializers get names the top level already checked.
+            _check_expand(type(self), expand)
+        only_top, only_nested = _split(only) if only is not None else (None, {})
+        expand_top, expand_nested = _split(expand)
+
+        for name, (serializer_class, options) in _expansions(type(self)).items():
+            if name not in fields or name not in expand_top:
+                continue
+            if issubclass(serializer_class, SparseFieldsetMixin):
+                options = {
+                    **options,
+                    "fields": only_nested.get(name),
+                    "expand": expand_nested.get(name, []),
+                }
+            fields[name] = serializer_class(read_only=True, **options)
+            fields[name].bind(name, self)
+
+        if only_top is not None:
+            fields = {name: field for name, field in fields.items() if name in only_top}
+        return fields
+
+    @property
+    def _readable_fields(self):
+        for field in self.rendered_fields.values():
+            if not field.write_only:
+                yield field
+
+
+def _apply(queryset, select, prefetch):
+    # Bare select_related() would follow every foreign key.
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+def _relations(serializer, prefix=""):
+    select, prefetch = [], []
+    model = serializer.Meta.model
+    extra = getattr(serializer.Meta, "field_relations", {})
+    for field in serializer._readable_fields:
+        name = field.field_name
+        select += [prefix + lookup for lookup in extra.get(name, ())]
+        if field.source == "*":
+            continue
+        path = prefix + field.source.replace(".", "__")
+        if isinstance(field, serializers.ListSerializer):
+            child_select, child_prefetch = _relations(field.child)
+            queryset = field.child.Meta.model._default_manager.all()
+            prefetch.append(Prefetch(path, _apply(queryset, child_select, child_prefetch)))
+        elif isinstance(field, serializers.BaseSerializer):
+            select.append(path)
+            child_select, child_prefetch = _relations(field, path + "__")
+            select += child_select
+            prefetch += child_prefetch
+        elif isinstance(field, serializers.ManyRelatedField):
+            relation = model._meta.get_field(field.source)
+            queryset = relation.related_model._default_manager.all()
+            if isinstance(relation, ManyToOneRel):
+                # Only the keys are rendered, plus the column prefetching joins on.
+                queryset = queryset.only(
+                    relation.related_model._meta.pk.attname, relation.field.attname
+                )
+            prefetch.append(Prefetch(path, queryset))
+    return select, prefetch
+
+
+def load_rendered_relations(queryset, serializer):
+    """
+    Add the select_related()/prefetch_related() lookups `serializer` needs
+    for what it renders: expanded relations, primary key lists, and the
+    relations listed in Meta.field_relations for computed fields.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    return _apply(queryset, *_relations(serializer))
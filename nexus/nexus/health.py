@@ -0,0 +1,116 @@
+"""
+Readiness checks for /v1/health/ready.
+
+Each check talks to one dependency and reports whether it answered and how
+long it took: every database (the primary plus replicas, which also report
+their lag), every configured cache, and the Celery broker. The primary
+database and the caches are required; replicas and the broker are not,
+since reads fall back to the primary and notifications wait in the outbox.
+
+Results are kept in process memory for HEALTH_CHECK_CACHE_SECONDS, so a
+load balancer polling every worker doesn't multiply into a stream of
+connections to the dependencies.
+"""
+
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+from .replicas import replica_lag
+
+CACHE_KEY = "health:ready"
+
+_lock = threading.Lock()
+# (monotonic expiry, report)
+_cached = (0.0, None)
+
+
+def _timed(check):
+    start = time.perf_counter()
+    try:
+        detail = check() or {}
+    except Exception as exc:
+        # The class is enough to tell what broke without leaking hosts or credentials.
+        detail = {"ok": False, "error": type(exc).__name__}
+    detail.setdefault("ok", True)
+    detail["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return detail
+
+
+def check_database(alias):
+    start = time.perf_counter()
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    if alias == DEFAULT_DB_ALIAS:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        return {"ok": elapsed_ms <= settings.HEALTH_DB_MAX_LATENCY_MS}
+    lag = replica_lag(alias)
+    return {"ok": lag is not None and lag <= settings.REPLICA_MAX_LAG, "lag_seconds": lag}
+
+
+def check_cache(alias):
+    cache = caches[alias]
+    token = uuid.uuid4().hex
+    cache.set(CACHE_KEY, token, 10)
+    return {"ok": cache.get(CACHE_KEY) == token}
+
+
+def check_broker():
+    from kombu import Connection
+
+    with Connection(
+        settings.CELERY_BROKER_URL, connect_timeout=settings.HEALTH_BROKER_TIMEOUT
+    ) as connection:
+        # One attempt; connect() would sleep and retry on a refused connection.
+        connection.ensure_connection(max_retries=0)
+
+
+def checks():
+    """(name, callable, required) for every dependency of this deployment."""
+    found = [
+        (f"database:{alias}", lambda alias=alias: check_database(alias), alias == DEFAULT_DB_ALIAS)
+        for alias in settings.DATABASES
+    ]
+    found += [
+        (f"cache:{alias}", lambda alias=alias: check_cache(alias), True)
+        for alias in settings.CACHES
+    ]
+    found.append(("broker", check_broker, False))
+    return found
+
+
+def run_checks():
+    results, ready, degraded = {}, True, False
+    for name, check, required in checks():
+        result = results[name] = _timed(check)
+        result["required"] = required
+        if not result["ok"]:
+            if required:
+                ready = False
+            else:
+                degraded = True
+    status = "unavailable" if not ready else "degraded" if degraded else "ready"
+    return {"status": status, "checked_at": timezone.now().isoformat(), "checks": results}
+
+
+def readiness():
+    """The latest report, rerunning the checks once it is older than the cache window."""
+    global _cached
+    with _lock:
+        expires, report = _cached
+        if report is None or time.monotonic() >= expires:
+            report = run_checks()
+            _cached = (time.monotonic() + settings.HEALTH_CHECK_CACHE_SECONDS, report)
+        return report
+
+
+def reset():
+    global _cached
+    with _lock:
+        _cached = (0.0, None)
@@ -0,0 +1,97 @@
+"""
+Startup profiling.
+
+Each target starts a fresh interpreter and does what that kind of process
+does before it can take work:
+
+    web     load the WSGI application and the URLconf (first request)
+    worker  load the Celery app and import the task modules, as a worker does
+
+profile() runs it under `python -X importtime` and returns every module
+imported with its own and cumulative import time; boot_seconds() times it
+without the profiler's overhead. The startup warm-up (nexus.warmup) is
+left out, since it logs its own timings. `manage.py importtime` prints the
+report, and the benchmark suite tracks boot time.
+"""
+
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import namedtuple
+
+from django.conf import settings
+
+TARGETS = {
+    "web": (
+        "import nexus.wsgi\n"
+        "from django.urls import get_resolver\n"
+        "get_resolver().url_patterns\n"
+    ),
+    "worker": (
+        "from nexus.celery import app\n"
+        "app.loader.import_default_modules()\n"
+    ),
+}
+
+Import = namedtuple("Import", "module self_us cumulative_us depth")
+Profile = namedtuple("Profile", "target imports")
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def _run(target, *options):
+    result = subprocess.run(
+        [sys.executable, *options, "-c", TARGETS[target]],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, "WARMUP_ON_STARTUP": "0"},
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        raise RuntimeError(f"{target} boot failed:\n{result.stderr[-2000:]}")
+    return result
+
+
+def profile(target):
+    """Every module `target` imports, in the order their imports finished."""
+    imports = []
+    for line in _run(target, "-X", "importtime").stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            imports.append(Import(module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return Profile(target, imports)
+
+
+def boot_seconds(target):
+    """Wall time for a fresh interpreter to boot `target`."""
+    start = time.perf_counter()
+    _run(target)
+    return time.perf_counter() - start
+
+
+def by_package(profile):
+    """{top-level package: own import time in µs}, largest first."""
+    totals = {}
+    for entry in profile.imports:
+        package = entry.module.partition(".")[0]
+        totals[package] = totals.get(package, 0) + entry.self_us
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+def importers(profile, module):
+    """The chain of modules whose import pulled in `module`, innermost first."""
+    chain = []
+    for i, entry in enumerate(profile.imports):
+        if entry.module != module:
+            continue
+        depth = entry.depth
+        # A parent finishes after its children, one level further out.
+        for parent in profile.imports[i + 1 :]:
+            if parent.depth < depth:
+                chain.append(parent.module)
+                depth = parent.depth
+        break
+    return chain
@@ -0,0 +1,28 @@
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from nexus.schema import generate_schema
+
+
+class Command(BaseCommand):
+    help = "Generate the OpenAPI schema served by /swagger/ and /redoc/ outside DEBUG."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=None,
+            help="File to write (defaults to OPENAPI_SCHEMA_FILE).",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["output"] or settings.OPENAPI_SCHEMA_FILE)
+        content = generate_schema()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Running workers never see a half-written file.
+        partial = path.with_name(f".{path.name}.tmp")
+        partial.write_bytes(content)
+        os.replace(partial, path)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(content)} bytes to {path}."))
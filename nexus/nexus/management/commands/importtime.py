@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from nexus import importtime
+
+
+class Command(BaseCommand):
+    help = "Report where a web or Celery worker process spends its startup imports."
+
+    def add_arguments(self, parser):
+        parser.add_argument("target", choices=sorted(importtime.TARGETS))
+        parser.add_argument(
+            "--limit", type=int, default=20, help="Packages and modules to list (default 20)."
+        )
+        parser.add_argument(
+            "--why",
+            metavar="MODULE",
+            action="append",
+            default=[],
+            help="Show which imports pulled in MODULE; repeatable.",
+        )
+
+    def handle(self, *args, **options):
+        target, limit = options["target"], options["limit"]
+        try:
+            seconds = importtime.boot_seconds(target)
+            profile = importtime.profile(target)
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+
+        total_ms = sum(entry.self_us for entry in profile.imports) / 1000
+        self.stdout.write(
+            f"{target}: booted in {seconds * 1000:.0f} ms, "
+            f"{len(profile.imports)} modules imported in {total_ms:.0f} ms"
+        )
+
+        self.stdout.write(f"\n{'package':<40}{'ms':>10}")
+        for package, self_us in list(importtime.by_package(profile).items())[:limit]:
+            self.stdout.write(f"{package:<40}{self_us / 1000:>10.1f}")
+
+        self.stdout.write(f"\n{'module (with its imports)':<40}{'ms':>10}")
+        slowest = sorted(profile.imports, key=lambda entry: -entry.cumulative_us)
+        for entry in slowest[:limit]:
+            self.stdout.write(f"{entry.module:<40}{entry.cumulative_us / 1000:>10.1f}")
+
+        for module in options["why"]:
+            chain = importtime.importers(profile, module)
+            if not chain and module not in {entry.module for entry in profile.imports}:
+                self.stdout.write(f"\n{module} is not imported")
+            else:
+                self.stdout.write(f"\n{module} <- " + " <- ".join(chain))
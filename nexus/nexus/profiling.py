@@ -0,0 +1,241 @@
+"""
+Request profiling and Prometheus metrics.
+
+ProfilingMiddleware profiles a request when it carries the PROFILING_HEADER
+header (`X-Profile: 1`) or is picked by PROFILING_SAMPLE_RATE. A profiled
+request records its database queries and their time, the time spent in the
+top-level serializers, and its total time. The figures feed histograms
+labelled with the resolved view action. The header is only honored for
+requests from INTERNAL_IPS or by staff users, who get the figures back in
+a Server-Timing header; the user is only known once the view has
+authenticated it, so other requests asking for it are profiled but
+discarded unless they were sampled anyway.
+
+render_metrics() writes the histograms in the Prometheus text format for
+/v1/metrics/.
+
+Histograms live in process memory, so each worker reports its own share
+and they reset on restart. Streamed response bodies are produced after the
+middleware returns and aren't included.
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+_lock = threading.Lock()
+
+
+class Histogram:
+    def __init__(self, name, documentation, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        # labels -> [count per bucket..., sum, count]
+        self._series = {}
+
+    def observe(self, labels, value):
+        with _lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * len(self.buckets) + [0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with _lock:
+            series = sorted((labels, list(values)) for labels, values in self._series.items())
+        for labels, values in series:
+            label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+            for bound, observed in zip(self.buckets, values):
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {observed}')
+            lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {values[-1]}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {values[-2]}")
+            lines.append(f"{self.name}_count{{{label_text}}} {values[-1]}")
+        return "\n".join(lines)
+
+    def clear(self):
+        with _lock:
+            self._series.clear()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_SECONDS = Histogram(
+    "nexus_request_duration_seconds", "Total time of profiled requests.", SECONDS_BUCKETS
+)
+DB_SECONDS = Histogram(
+    "nexus_db_duration_seconds", "Database time per profiled request.", SECONDS_BUCKETS
+)
+DB_QUERIES = Histogram("nexus_db_queries", "Database queries per profiled request.", QUERY_BUCKETS)
+SERIALIZER_SECONDS = Histogram(
+    "nexus_serializer_duration_seconds", "Serializer time per profiled request.", SECONDS_BUCKETS
+)
+HISTOGRAMS = [REQUEST_SECONDS, DB_SECONDS, DB_QUERIES, SERIALIZER_SECONDS]
+
+
+def render_metrics():
+    return "\n".join(histogram.render() for histogram in HISTOGRAMS) + "\n"
+
+
+class Profile:
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.sections = {}
+
+
+_profile = ContextVar("request_profile", default=None)
+
+
+def current_profile():
+    return _profile.get()
+
+
+@contextmanager
+def profile_section(name):
+    """Add the time spent in the block to the current profile's `name`."""
+    profile = _profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.sections[name] = profile.sections.get(name, 0.0) + time.perf_counter() - start
+
+
+def record_query(execute, sql, params, many, context):
+    profile = _profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.db_seconds += time.perf_counter() - start
+        profile.queries += 1
+
+
+def install_query_recorder(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+# New connections get the recorder as they open; it does nothing outside a
+# profiled request.
+connection_created.connect(install_query_recorder)
+
+
+def endpoint_name(request):
+    """`<View>.<action>` for the view that served `request`."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unresolved"
+    cls = getattr(match.func, "cls", None)
+    if cls is None:
+        return match.view_name or "unknown"
+    method = request.method.lower()
+    actions = getattr(match.func, "actions", None) or {}
+    return f"{cls.__name__}.{actions.get(method, method)}"
+
+
+def may_request_profile(request):
+    """Whether `request` comes from INTERNAL_IPS or a staff user."""
+    if request.META.get("REMOTE_ADDR") in settings.INTERNAL_IPS:
+        return True
+    user = getattr(request, "user", None)
+    return bool(user is not None and user.is_authenticated and user.is_staff)
+
+
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def requested(self, request):
+        header = settings.PROFILING_HEADER
+        return bool(header) and request.headers.get(header, "") not in ("", "0")
+
+    def sampled(self):
+        rate = settings.PROFILING_SAMPLE_RATE
+        return rate > 0 and random.random() < rate
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        requested, sampled = self.requested(request), self.sampled()
+        if not (requested or sampled):
+            return self.get_response(request)
+        # Connections opened before this module was imported.
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+        profile = Profile()
+        token = _profile.set(profile)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _profile.reset(token)
+        elapsed = time.perf_counter() - start
+        requested = requested and may_request_profile(request)
+        return self.record(request, response, profile, elapsed, requested, sampled)
+
+    async def __acall__(self, request):
+        requested, sampled = self.requested(request), self.sampled()
+        if not (requested or sampled):
+            return await self.get_response(request)
+        profile = Profile()
+        token = _profile.set(profile)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _profile.reset(token)
+        elapsed = time.perf_counter() - start
+        # A session user that no view has loaded yet needs a sync query.
+        requested = requested and await sync_to_async(may_request_profile)(request)
+        return self.record(request, response, profile, elapsed, requested, sampled)
+
+    def record(self, request, response, profile, elapsed, requested, sampled):
+        if not (requested or sampled):
+            return response
+        labels = (("endpoint", endpoint_name(request)), ("method", request.method))
+        serializer_seconds = profile.sections.get("serializer", 0.0)
+        REQUEST_SECONDS.observe(labels, elapsed)
+        DB_SECONDS.observe(labels, profile.db_seconds)
+        DB_QUERIES.observe(labels, profile.queries)
+        SERIALIZER_SECONDS.observe(labels, serializer_seconds)
+        if not requested:
+            return response
+        response["Server-Timing"] = ", ".join(
+            [
+                f"db;dur={profile.db_seconds * 1000:.2f};desc=\"{profile.queries} queries\"",
+                f"serializer;dur={serializer_seconds * 1000:.2f}",
+                f"total;dur={elapsed * 1000:.2f}",
+            ]
+        )
+        return response
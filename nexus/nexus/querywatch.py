@@ -0,0 +1,157 @@
+"""
+Slow-query and N+1 detection.
+
+Inside a watch (QueryWatchMiddleware opens one per request when
+QUERY_WATCH is on; watch_queries() does the same for tasks and tests),
+every statement is fingerprinted by its SQL with parameters and IN lists
+collapsed. The watch logs:
+
+- a fingerprint seen QUERY_WATCH_REPEAT times, the usual sign of a
+  per-object query in a loop;
+- any statement slower than QUERY_WATCH_SLOW_MS.
+
+Each entry names the view that was serving the request and the first frame
+of project code that issued the query. With QUERY_WATCH_RAISE set, both
+raise QueryWatchError instead, which turns them into test failures.
+"""
+
+import logging
+import re
+import time
+import traceback
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from . import profiling
+from .profiling import endpoint_name
+
+logger = logging.getLogger(__name__)
+
+# Statements worth counting; transaction control and savepoints repeat by design.
+WATCHED = ("SELECT", "INSERT", "UPDATE", "DELETE")
+
+_IN_LIST = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_SPACE = re.compile(r"\s+")
+
+_PROJECT_DIR = str(Path(__file__).resolve().parent.parent)
+# Execute wrappers that sit between Django and watch_query().
+_WRAPPER_FILES = {__file__, profiling.__file__}
+
+
+class QueryWatchError(AssertionError):
+    pass
+
+
+def fingerprint(sql):
+    sql = _SPACE.sub(" ", sql).strip()
+    return _NUMBER.sub("N", _IN_LIST.sub("(%s, ...)", sql))
+
+
+class Watch:
+    def __init__(self, label):
+        self.label = label
+        self.counts = {}
+
+    def describe(self):
+        return self.label() if callable(self.label) else self.label
+
+
+_watch = ContextVar("query_watch", default=None)
+
+
+def _caller():
+    """file:line of the innermost project frame that isn't an execute wrapper."""
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename.startswith(_PROJECT_DIR) and frame.filename not in _WRAPPER_FILES:
+            return f"{frame.filename[len(_PROJECT_DIR) + 1:]}:{frame.lineno}"
+    return "unknown"
+
+
+def _report(kind, message, *args):
+    if settings.QUERY_WATCH_RAISE:
+        raise QueryWatchError(message % args)
+    logger.warning(message, *args, extra={"query_watch": kind})
+
+
+def watch_query(execute, sql, params, many, context):
+    watch = _watch.get()
+    if watch is None or not sql.lstrip()[:6].upper().startswith(WATCHED):
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    result = execute(sql, params, many, context)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    shape = fingerprint(sql)
+    watch.counts[shape] = seen = watch.counts.get(shape, 0) + 1
+    if seen == settings.QUERY_WATCH_REPEAT:
+        _report(
+            "repeated",
+            "Query repeated %d times in %s (%s): %s",
+            seen,
+            watch.describe(),
+            _caller(),
+            shape,
+        )
+    if elapsed_ms > settings.QUERY_WATCH_SLOW_MS:
+        _report(
+            "slow",
+            "Slow query (%.1f ms) in %s (%s): %s",
+            elapsed_ms,
+            watch.describe(),
+            _caller(),
+            sql,
+        )
+    return result
+
+
+def install_query_watch(connection, **kwargs):
+    if watch_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(watch_query)
+
+
+connection_created.connect(install_query_watch)
+
+
+@contextmanager
+def watch_queries(label):
+    """Watch the queries run inside the block; `label` names it in reports."""
+    for connection in connections.all(initialized_only=True):
+        install_query_watch(connection)
+    token = _watch.set(Watch(label))
+    try:
+        yield
+    finally:
+        _watch.reset(token)
+
+
+class QueryWatchMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.QUERY_WATCH:
+            return self.get_response(request)
+        # The view is only known once the URL has been resolved.
+        with watch_queries(lambda: endpoint_name(request)):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        if not settings.QUERY_WATCH:
+            return await self.get_response(request)
+        with watch_queries(lambda: endpoint_name(request)):
+            return await self.get_response(request)
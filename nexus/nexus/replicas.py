@@ -0,0 +1,172 @@
+"""
+Read replica routing.
+
+Reads go to a replica (settings.DATABASE_REPLICAS) only inside a request
+whose view opted in through ReplicaReadMixin, for its list/retrieve
+actions. Everything else — writes, other actions, Celery tasks, management
+commands — uses the primary. After a request writes, its user is pinned to
+the primary for REPLICA_PIN_SECONDS so they read their own writes, and
+replicas more than REPLICA_MAX_LAG seconds behind are skipped.
+"""
+
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+PIN_KEY = "replica:pin:{}"
+
+# Seconds a replica is behind the primary, per vendor. Backends without an
+# entry (SQLite copies, for instance) are treated as up to date.
+LAG_SQL = {
+    "postgresql": (
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+    ),
+}
+
+
+class RoutingScope:
+    """Per-request routing state, shared by every thread serving the request."""
+
+    def __init__(self):
+        self.use_replica = False
+        self.wrote = False
+
+
+_scope = ContextVar("replica_routing_scope", default=None)
+
+
+def current_scope():
+    return _scope.get()
+
+
+def is_pinned(user):
+    return user.is_authenticated and bool(cache.get(PIN_KEY.format(user.pk)))
+
+
+def pin_to_primary(user):
+    cache.set(PIN_KEY.format(user.pk), True, settings.REPLICA_PIN_SECONDS)
+
+
+def replica_lag(alias):
+    """Seconds `alias` is behind the primary, or None if it can't be queried."""
+    connection = connections[alias]
+    sql = LAG_SQL.get(connection.vendor)
+    if sql is None:
+        return 0.0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+            (lag,) = cursor.fetchone()
+    except DatabaseError:
+        return None
+    return float(lag or 0)
+
+
+class ReplicaRouter:
+    def __init__(self):
+        # alias -> (checked at, usable); lag is measured at most once per
+        # REPLICA_LAG_CHECK_INTERVAL per process.
+        self._health = {}
+
+    def measure_lag(self, alias):
+        return replica_lag(alias)
+
+    def usable_replicas(self):
+        now = time.monotonic()
+        usable = []
+        for alias in settings.DATABASE_REPLICAS:
+            checked_at, ok = self._health.get(alias, (None, False))
+            if checked_at is None or now - checked_at >= settings.REPLICA_LAG_CHECK_INTERVAL:
+                lag = self.measure_lag(alias)
+                ok = lag is not None and lag <= settings.REPLICA_MAX_LAG
+                self._health[alias] = (now, ok)
+            if ok:
+                usable.append(alias)
+        return usable
+
+    def db_for_read(self, model, **hints):
+        scope = _scope.get()
+        if scope is None or not scope.use_replica or scope.wrote:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        replicas = self.usable_replicas()
+        return random.choice(replicas) if replicas else None
+
+    def db_for_write(self, model, **hints):
+        scope = _scope.get()
+        if scope is not None:
+            scope.wrote = True
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+
+class ReplicaPinningMiddleware:
+    """
+    Opens a RoutingScope for each request and, when the request wrote to
+    the database, pins its user to the primary for REPLICA_PIN_SECONDS.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        scope = RoutingScope()
+        token = _scope.set(scope)
+        try:
+            response = self.get_response(request)
+        finally:
+            _scope.reset(token)
+        if scope.wrote and settings.DATABASE_REPLICAS:
+            self.pin_writer(request)
+        return response
+
+    async def __acall__(self, request):
+        scope = RoutingScope()
+        token = _scope.set(scope)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _scope.reset(token)
+        if scope.wrote and settings.DATABASE_REPLICAS:
+            await sync_to_async(self.pin_writer)(request)
+        return response
+
+    def pin_writer(self, request):
+        # DRF copies the user it authenticated onto the Django request.
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            pin_to_primary(user)
+
+
+class ReplicaReadMixin:
+    """Lets a view's `replica_actions` read from a replica unless the user is pinned."""
+
+    replica_actions = ("list", "retrieve")
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        scope = current_scope()
+        if (
+            scope is not None
+            and settings.DATABASE_REPLICAS
+            and self.action in self.replica_actions
+            and not is_pinned(request.user)
+        ):
+            scope.use_replica = True
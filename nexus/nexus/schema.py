@@ -0,0 +1,159 @@
+"""
+Precomputed OpenAPI schema.
+
+Generating the schema introspects every viewset and serializer, which is
+too slow to repeat for each hit on the docs. `manage.py generate_schema`
+renders it once, at build time, to OPENAPI_SCHEMA_FILE. Outside DEBUG the
+schema views serve that file from memory with an ETag, so the Swagger and
+ReDoc pages revalidate with a 304; in DEBUG they generate it live so the
+docs follow code changes.
+
+The file leaves out the host and scheme, and clients use the ones that
+served it. If it is missing, each process generates the schema once and
+logs a warning.
+
+drf_yasg is imported only when the docs are first requested or the schema
+is generated; docs_view() stands in for the UI views until then.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.urls import get_resolver
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.csrf import csrf_exempt
+
+from .docs import apply_overrides
+
+logger = logging.getLogger(__name__)
+
+# Spec renderer formats served from the file; everything else (the UI pages) is live.
+FORMATS = ("openapi", "json", "yaml")
+
+# "json" or "yaml" -> Document
+_documents = {}
+
+
+class Document:
+    def __init__(self, content):
+        self.content = content
+        self.etag = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+@functools.cache
+def api_info():
+    from drf_yasg import openapi
+
+    return openapi.Info(
+        title="Project NExus API",
+        default_version="v1",
+        description="Public API documentation",
+    )
+
+
+def _load_view_overrides():
+    # Every view module has to be imported for its swagger_auto_schema overrides.
+    get_resolver().url_patterns
+    apply_overrides()
+
+
+def generate_schema():
+    """The schema as JSON bytes, generated for an anonymous request."""
+    from django.test import RequestFactory
+    from drf_yasg.codecs import OpenAPICodecJson
+    from rest_framework.request import Request
+
+    _load_view_overrides()
+    view = schema_view()
+    # url="" keeps the host and scheme out of the document.
+    generator = view.generator_class(api_info(), url="")
+    request = Request(RequestFactory().get("/swagger/"))
+    schema = generator.get_schema(request, public=view.public)
+    return OpenAPICodecJson(validators=[]).encode(schema)
+
+
+def _read_schema():
+    path = Path(settings.OPENAPI_SCHEMA_FILE)
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        logger.warning(
+            "%s is missing, generating the OpenAPI schema in process; "
+            "run `manage.py generate_schema` when building.",
+            path,
+        )
+        return generate_schema()
+
+
+def load_document(format):
+    """The Document served for a spec renderer format."""
+    key = "yaml" if format == "yaml" else "json"
+    document = _documents.get(key)
+    if document is not None:
+        return document
+    if key == "yaml":
+        from drf_yasg.codecs import yaml_sane_dump
+
+        content = yaml_sane_dump(json.loads(load_document("json").content), binary=True)
+    else:
+        content = _read_schema()
+    document = _documents[key] = Document(content)
+    return document
+
+
+def reset():
+    _documents.clear()
+
+
+def precomputed(view_class):
+    """`view_class` (from get_schema_view()) answering spec requests from the file."""
+
+    class PrecomputedSchemaView(view_class):
+        def get(self, request, version="", format=None):
+            renderer = request.accepted_renderer
+            if settings.DEBUG or renderer.format not in FORMATS:
+                _load_view_overrides()
+                return super().get(request, version, format)
+            document = load_document(renderer.format)
+            response = get_conditional_response(request, etag=document.etag)
+            if response is None:
+                response = HttpResponse(
+                    document.content, content_type=f"{renderer.media_type}; charset=utf-8"
+                )
+            response["ETag"] = document.etag
+            # Cacheable, but checked against the ETag on every use.
+            patch_cache_control(response, public=True, no_cache=True)
+            return response
+
+    return PrecomputedSchemaView
+
+
+@functools.cache
+def schema_view():
+    """The drf_yasg schema view class, built on first use."""
+    from drf_yasg.views import get_schema_view
+    from rest_framework import permissions
+
+    return precomputed(
+        get_schema_view(api_info(), public=True, permission_classes=[permissions.AllowAny])
+    )
+
+
+@functools.cache
+def _ui_view(renderer):
+    return schema_view().with_ui(renderer, cache_timeout=0)
+
+
+def docs_view(renderer):
+    """The `renderer` ("swagger" or "redoc") docs view, built on its first request."""
+
+    @csrf_exempt
+    def view(request, *args, **kwargs):
+        return _ui_view(renderer)(request, *args, **kwargs)
+
+    return view
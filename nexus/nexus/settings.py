@@ -15,6 +15,8 @@ import os
 from datetime import timedelta
 from dotenv import load_dotenv
 
+from nexus.database import database_from_url
+
 load_dotenv()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -46,13 +48,26 @@ CELERY_BROKER_URL = os.getenv(
 )
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "rpc://")
 CELERY_BEAT_SCHEDULE = {
-    "ping-hosted-app": {
-        "task": "notifications.tasks.ping_endpoint",
-        "schedule": timedelta(minutes=13),
+    "relay-notification-outbox": {
+        "task": "notifications.tasks.relay_notification_outbox",
+        "schedule": timedelta(seconds=float(os.getenv("NOTIFICATION_RELAY_INTERVAL", "5"))),
+    },
+    "refresh-analytics-rollups": {
+        "task": "analytics.tasks.refresh_analytics_rollups",
+        "schedule": timedelta(seconds=float(os.getenv("ANALYTICS_ROLLUP_INTERVAL", "300"))),
     },
 }
 
 
+# Maximum number of outbox messages handed to one bulk notification task.
+NOTIFICATION_BATCH_SIZE = int(os.getenv("NOTIFICATION_BATCH_SIZE", "100"))
+
+# Source rows updated less than this many seconds ago wait for the next
+# rollup refresh, so transactions still in flight aren't skipped.
+ANALYTICS_ROLLUP_SETTLE = int(os.getenv("ANALYTICS_ROLLUP_SETTLE", "60"))
+# Longest date range /v1/analytics/teacher/ answers in one request.
+ANALYTICS_MAX_RANGE_DAYS = int(os.getenv("ANALYTICS_MAX_RANGE_DAYS", "366"))
+
 
 # Application definition
 
@@ -71,14 +86,19 @@ INSTALLED_APPS = [
     "courses",
     "payments",
     "notifications",
+    "analytics",
+    "nexus",
 ]
 
 MIDDLEWARE = [
+    "nexus.profiling.ProfilingMiddleware",
+    "nexus.querywatch.QueryWatchMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    "nexus.replicas.ReplicaPinningMiddleware",
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     "whitenoise.middleware.WhiteNoiseMiddleware",
@@ -107,12 +127,112 @@ WSGI_APPLICATION = 'nexus.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# DATABASE_URL picks the backend (see nexus.database); PostgreSQL is the
+# production choice, SQLite with WAL is fine for a single host. Postgres keeps
+# connections for DB_CONN_MAX_AGE seconds, or with DB_POOL=1 hands them out
+# from a psycopg_pool of DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE connections.
+
+DATABASE_OPTIONS = {
+    "conn_max_age": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+    "pool": os.getenv("DB_POOL") == "1",
+    "pool_min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+    "pool_max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+    "sqlite_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", "20")),
+}
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+    "default": database_from_url(
+        # An empty DATABASE_URL counts as unset.
+        os.getenv("DATABASE_URL") or "sqlite:///db.sqlite3", BASE_DIR, **DATABASE_OPTIONS
+    )
+}
+
+# Read replicas: DATABASE_REPLICA_URLS is a comma-separated list of URLs,
+# exposed as "replica1", "replica2", ... List/retrieve endpoints read from
+# them (see nexus.replicas); a user who just wrote reads from the primary for
+# REPLICA_PIN_SECONDS, and replicas lagging more than REPLICA_MAX_LAG seconds
+# are skipped. Tests mirror them onto the default database.
+
+DATABASE_REPLICAS = []
+for _number, _url in enumerate(
+    filter(None, (url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(","))),
+    start=1,
+):
+    DATABASE_REPLICAS.append(f"replica{_number}")
+    DATABASES[f"replica{_number}"] = {
+        **database_from_url(_url, BASE_DIR, **DATABASE_OPTIONS),
+        "TEST": {"MIRROR": "default"},
     }
+
+DATABASE_ROUTERS = ["nexus.replicas.ReplicaRouter"]
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", "10"))
+REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", "5"))
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", "1"))
+
+# Request profiling (nexus.profiling): requests sending PROFILING_HEADER
+# (set it empty to disable) from INTERNAL_IPS or a staff user, and a
+# PROFILING_SAMPLE_RATE share of all requests, are profiled into the
+# histograms served at /v1/metrics/. Scrapes must send
+# "Authorization: Bearer <METRICS_TOKEN>"; without a token the endpoint
+# is only open in DEBUG.
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_HEADER = os.getenv("PROFILING_HEADER", "X-Profile")
+INTERNAL_IPS = list(filter(None, (ip.strip() for ip in os.getenv("INTERNAL_IPS", "").split(","))))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Slow-query and N+1 detection (nexus.querywatch), on by default in DEBUG.
+# A query shape seen QUERY_WATCH_REPEAT times in one request, or a query
+# slower than QUERY_WATCH_SLOW_MS, is logged; with QUERY_WATCH_RAISE=1 it
+# raises instead, for test runs.
+QUERY_WATCH = os.getenv("QUERY_WATCH", "1" if DEBUG else "0") == "1"
+QUERY_WATCH_RAISE = os.getenv("QUERY_WATCH_RAISE") == "1"
+QUERY_WATCH_REPEAT = int(os.getenv("QUERY_WATCH_REPEAT", "5"))
+QUERY_WATCH_SLOW_MS = float(os.getenv("QUERY_WATCH_SLOW_MS", "200"))
+
+# Health checks (nexus.health): /v1/health/ready reruns its checks at most
+# every HEALTH_CHECK_CACHE_SECONDS per process and fails when the primary
+# database answers slower than HEALTH_DB_MAX_LATENCY_MS. Workers warm up
+# (nexus.warmup) before taking traffic unless WARMUP_ON_STARTUP=0.
+HEALTH_CHECK_CACHE_SECONDS = float(os.getenv("HEALTH_CHECK_CACHE_SECONDS", "5"))
+HEALTH_DB_MAX_LATENCY_MS = float(os.getenv("HEALTH_DB_MAX_LATENCY_MS", "500"))
+HEALTH_BROKER_TIMEOUT = float(os.getenv("HEALTH_BROKER_TIMEOUT", "1"))
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "0" if DEBUG else "1") == "1"
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory is per process; point this at Redis/Memcached when running
+# several workers so catalog invalidation and token revocation reach all
+# of them.
+
+AUTH_TOKEN_CACHE_TTL = int(os.getenv("AUTH_TOKEN_CACHE_TTL", "60"))
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "DJANGO_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("DJANGO_CACHE_LOCATION", "nexus"),
+    },
+    # Token -> user snapshots for users.authentication.CachedTokenAuthentication.
+    "auth": {
+        "BACKEND": os.getenv(
+            "DJANGO_AUTH_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("DJANGO_AUTH_CACHE_LOCATION", "nexus-auth"),
+        "TIMEOUT": AUTH_TOKEN_CACHE_TTL,
+    },
 }
+# LocMemCache evicts the least recently used entries past MAX_ENTRIES.
+if CACHES["auth"]["BACKEND"].endswith("LocMemCache"):
+    CACHES["auth"]["OPTIONS"] = {"MAX_ENTRIES": int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))}
+
+CATALOG_CACHE_TIMEOUT = int(os.getenv("CATALOG_CACHE_TIMEOUT", "300"))
+
+# Course search index backend; picked from the database vendor when unset
+# (SQLite FTS5 or PostgreSQL tsvector, see courses.search).
+COURSE_SEARCH_BACKEND = os.getenv("COURSE_SEARCH_BACKEND") or None
+COURSE_SEARCH_MAX_RESULTS = int(os.getenv("COURSE_SEARCH_MAX_RESULTS", "1000"))
 
 
 # Password validation
@@ -133,6 +253,31 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# New passwords use PASSWORD_HASHER: "pbkdf2", "scrypt" or "argon2" (needs
+# argon2-cffi). Hashes from the other two still verify and are rehashed on
+# the user's next login, as are hashes made with a different cost. Leave a
+# cost unset to keep Django's default.
+
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "pbkdf2")
+_PASSWORD_HASHERS = {
+    "pbkdf2": "users.hashers.PBKDF2PasswordHasher",
+    "scrypt": "users.hashers.ScryptPasswordHasher",
+    "argon2": "users.hashers.Argon2PasswordHasher",
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+]
+PBKDF2_ITERATIONS = int(os.getenv("PBKDF2_ITERATIONS", "0")) or None
+SCRYPT_WORK_FACTOR = int(os.getenv("SCRYPT_WORK_FACTOR", "0")) or None
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "0")) or None
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "0")) or None
+
+AUTHENTICATION_BACKENDS = ["users.backends.ModelBackend"]
+
+# Threads that hash passwords for the async login view (users.hashers).
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -153,20 +298,30 @@ STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
+# Written by `manage.py generate_schema` and served by the docs views outside
+# DEBUG (see nexus.schema).
+OPENAPI_SCHEMA_FILE = os.getenv("OPENAPI_SCHEMA_FILE", str(BASE_DIR / "openapi.json"))
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "users.authentication.CachedTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "nexus.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
+    # Only the login view opts into these (users.throttles). The per-IP rate
+    # is generous because a whole classroom often shares one address.
+    "DEFAULT_THROTTLE_RATES": {
+        "login_email": os.getenv("LOGIN_THROTTLE_EMAIL_RATE", "10/min"),
+        "login_ip": os.getenv("LOGIN_THROTTLE_IP_RATE", "120/min"),
+    },
 }
 
 AUTH_USER_MODEL = "users.User"
@@ -16,33 +16,23 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include, re_path
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 
+from nexus.schema import docs_view
 from nexus.views import welcome
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Project NExus API",
-        default_version="v1",
-        description="Public API documentation",
-    ),
-    public=True,
-    permission_classes=[permissions.AllowAny],
-)
-
 v1_patterns = [
     path("admin/", admin.site.urls),
     path("users/", include("users.urls")),
     path("", include("courses.urls")),
     path("payments/", include("payments.urls")),
     path("", include("notifications.urls")),
+    path("analytics/", include("analytics.urls")),
 ]
 
 urlpatterns = [
     path("", welcome),
     path("v1/", include((v1_patterns, "v1"), namespace="v1")),
-    re_path(r"^swagger/$", schema_view.with_ui("swagger", cache_timeout=0)),
-    re_path(r"^redoc/$", schema_view.with_ui("redoc", cache_timeout=0)),
+    # Serve the file written by `manage.py generate_schema` unless DEBUG; see nexus.schema.
+    re_path(r"^swagger/$", docs_view("swagger")),
+    re_path(r"^redoc/$", docs_view("redoc")),
 ]
@@ -1,3 +1,6 @@
+import inspect
+
+from asgiref.sync import sync_to_async
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
@@ -5,4 +8,34 @@ from rest_framework.response import Response
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def welcome(request):
-    return Response({"message": "Welcome to Project Nexus, go to /swagger for routes documentation and testing"})
\ No newline at end of file
+    return Response({"message": "Welcome to Project Nexus, go to /swagger for routes documentation and testing"})
+
+
+class AsyncAPIViewMixin:
+    """
+    Lets an APIView declare `async def` handlers. Django serves the view
+    natively under ASGI (and through async_to_sync under WSGI); initial(),
+    which runs the authenticators, permissions and throttles and may touch
+    the database, is moved off the event loop.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        # APIView.dispatch(), awaiting the handler.
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
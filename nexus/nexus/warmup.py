@@ -0,0 +1,92 @@
+"""
+Startup warm-up.
+
+wsgi.py and asgi.py call warm_up() once the application is loaded, so work
+that Django, DRF and drf_yasg otherwise do lazily on the first requests is
+paid before the worker takes traffic:
+
+- every URL pattern's regex is compiled and the reverse map is built;
+- each routed view's serializer is instantiated and its fields built, which
+  imports the serializer modules and fills the model _meta caches;
+- the OpenAPI schema is loaded (generated live in DEBUG), see nexus.schema;
+- a connection to every database is opened (and, with DB_POOL, the pool).
+
+Set WARMUP_ON_STARTUP=0 to skip it. A failing step is logged and skipped;
+warm-up never stops a worker from starting.
+"""
+
+import logging
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.urls import URLResolver, get_resolver
+
+logger = logging.getLogger(__name__)
+
+
+def _patterns(resolver):
+    for pattern in resolver.url_patterns:
+        yield pattern
+        if isinstance(pattern, URLResolver):
+            yield from _patterns(pattern)
+
+
+def warm_urls():
+    resolver = get_resolver()
+    for pattern in _patterns(resolver):
+        pattern.pattern.regex
+    resolver.reverse_dict
+
+
+def warm_serializers():
+    seen = set()
+    for pattern in _patterns(get_resolver()):
+        view = getattr(getattr(pattern, "callback", None), "cls", None)
+        serializer_class = getattr(view, "serializer_class", None)
+        if serializer_class is None or serializer_class in seen:
+            continue
+        seen.add(serializer_class)
+        serializer_class(context={}).fields
+
+
+def warm_schema():
+    from nexus import schema
+
+    if settings.DEBUG:
+        schema.generate_schema()
+    else:
+        schema.load_document("openapi")
+
+
+def warm_databases():
+    for connection in connections.all():
+        connection.ensure_connection()
+
+
+STEPS = [
+    ("urls", warm_urls),
+    ("serializers", warm_serializers),
+    ("schema", warm_schema),
+    ("databases", warm_databases),
+]
+
+
+def warm_up():
+    """Run every step; returns {step: seconds} for the ones that succeeded."""
+    if not settings.WARMUP_ON_STARTUP:
+        return {}
+    timings = {}
+    for name, step in STEPS:
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            logger.exception("Warm-up step %s failed", name)
+            continue
+        timings[name] = time.perf_counter() - start
+    logger.info(
+        "Warm-up done: %s",
+        ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings.items()),
+    )
+    return timings
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from notifications.outbox import relay_outbox
+
+
+class Command(BaseCommand):
+    help = "Relay pending notification outbox messages to the Celery broker."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Messages per batch (defaults to NOTIFICATION_BATCH_SIZE).",
+        )
+
+    def handle(self, *args, **options):
+        relayed = relay_outbox(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Relayed {relayed} notifications."))
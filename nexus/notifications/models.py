@@ -1,3 +1,24 @@
 from django.db import models
 
-# Create your models here.
+
+class OutboxMessage(models.Model):
+    """
+    A notification waiting to be handed to the broker. Rows are written in
+    the same transaction as the change they announce and drained by
+    notifications.outbox.relay_outbox, so delivery is at-least-once.
+    """
+
+    class Kind(models.TextChoices):
+        PAYMENT_RECEIPT = "PAYMENT_RECEIPT", "Payment receipt"
+        ENROLLMENT = "ENROLLMENT", "Enrollment notification"
+
+    kind = models.CharField(max_length=32, choices=Kind.choices)
+    object_id = models.PositiveBigIntegerField()
+    attempts = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self) -> str:
+        return f"{self.kind} #{self.object_id}"
@@ -0,0 +1,71 @@
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+# kind -> bulk task in notifications.tasks that takes a list of ids
+BULK_TASKS = {
+    OutboxMessage.Kind.PAYMENT_RECEIPT: "send_payment_receipts",
+    OutboxMessage.Kind.ENROLLMENT: "send_enrollment_notifications",
+}
+
+
+def enqueue_notifications(messages):
+    """
+    Record (kind, object_id) pairs in the outbox with a single INSERT.
+    Call inside the transaction that makes the change being announced.
+    """
+    OutboxMessage.objects.bulk_create(
+        [OutboxMessage(kind=kind, object_id=object_id) for kind, object_id in messages]
+    )
+
+
+def relay_outbox(batch_size=None):
+    """
+    Drain the outbox to the broker, one bulk task per kind per batch.
+    Rows are deleted only after their task was enqueued; a failed enqueue
+    bumps `attempts` and leaves them for the next run. Returns the number
+    of messages relayed.
+    """
+    # Binds the shared tasks to the configured app; web processes don't load it.
+    import nexus.celery  # noqa: F401
+    from notifications import tasks
+
+    batch_size = batch_size or settings.NOTIFICATION_BATCH_SIZE
+    relayed = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                OutboxMessage.objects.select_for_update(skip_locked=True)
+                .order_by("id")
+                .values_list("id", "kind", "object_id")[:batch_size]
+            )
+            if not rows:
+                return relayed
+
+            by_kind = defaultdict(dict)
+            for row_id, kind, object_id in rows:
+                by_kind[kind][row_id] = object_id
+
+            failed = False
+            for kind, messages in by_kind.items():
+                try:
+                    # Duplicate ids collapse into one message reflecting current state.
+                    getattr(tasks, BULK_TASKS[kind]).delay(sorted(set(messages.values())))
+                except Exception:
+                    logger.warning("Could not relay %s notifications", kind, exc_info=True)
+                    OutboxMessage.objects.filter(id__in=messages).update(
+                        attempts=F("attempts") + 1
+                    )
+                    failed = True
+                    continue
+                OutboxMessage.objects.filter(id__in=messages).delete()
+                relayed += len(messages)
+        if failed or len(rows) < batch_size:
+            return relayed
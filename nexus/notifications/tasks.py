@@ -1,9 +1,8 @@
 import logging
-import urllib.request
 
 from celery import shared_task
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection
 
 from payments.models import Payment
 from courses.models import Enrollment
@@ -11,13 +10,11 @@ from courses.models import Enrollment
 logger = logging.getLogger(__name__)
 
 
-@shared_task
-def send_payment_receipt(payment_id: int):
-    """
-    Send a simple payment receipt email.
-    Uses console backend by default (prints to stdout) unless configured otherwise.
-    """
-    payment = Payment.objects.select_related("learner", "course").get(id=payment_id)
+def _from_email():
+    return getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@nexus.local")
+
+
+def _payment_receipt_message(payment):
     subject = f"Payment receipt for {payment.course.title}"
     message = (
         f"Hi {payment.learner.email},\n\n"
@@ -25,43 +22,67 @@ def send_payment_receipt(payment_id: int):
         f"Reference: {payment.reference}\n\n"
         "Thank you for learning with Project NExus!"
     )
-    send_mail(
-        subject,
-        message,
-        getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@nexus.local"),
-        [payment.learner.email],
-        fail_silently=True,
-    )
-    return f"Sent payment receipt to {payment.learner.email}"
+    return EmailMessage(subject, message, _from_email(), [payment.learner.email])
 
 
-@shared_task
-def send_enrollment_notification(enrollment_id: int):
-    enrollment = Enrollment.objects.select_related("learner", "course").get(id=enrollment_id)
+def _enrollment_message(enrollment):
     subject = f"Enrollment update for {enrollment.course.title}"
     message = (
         f"Hi {enrollment.learner.email},\n\n"
         f"Your enrollment status for {enrollment.course.title} is now {enrollment.status}.\n"
     )
-    send_mail(
-        subject,
-        message,
-        getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@nexus.local"),
-        [enrollment.learner.email],
-        fail_silently=True,
-    )
+    return EmailMessage(subject, message, _from_email(), [enrollment.learner.email])
+
+
+def _send_batch(messages):
+    """Deliver all messages over a single backend connection."""
+    if not messages:
+        return 0
+    with get_connection(fail_silently=True) as connection:
+        return connection.send_messages(messages) or 0
+
+
+@shared_task
+def send_payment_receipt(payment_id: int):
+    """
+    Send a simple payment receipt email.
+    Uses console backend by default (prints to stdout) unless configured otherwise.
+    """
+    payment = Payment.objects.select_related("learner", "course").get(id=payment_id)
+    _send_batch([_payment_receipt_message(payment)])
+    return f"Sent payment receipt to {payment.learner.email}"
+
+
+@shared_task
+def send_enrollment_notification(enrollment_id: int):
+    enrollment = Enrollment.objects.select_related("learner", "course").get(id=enrollment_id)
+    _send_batch([_enrollment_message(enrollment)])
     return f"Sent enrollment notification to {enrollment.learner.email}"
 
 
 @shared_task
-def ping_endpoint():
+def send_payment_receipts(payment_ids: list[int]):
     """
-    Lightweight GET request to keep the hosted instance warm.
+    Bulk variant of send_payment_receipt: one query for every payment and
+    one mail connection for every message.
     """
-    url = "https://project-nexus-j3pl.onrender.com/v1"
-    try:
-        with urllib.request.urlopen(url, timeout=10) as resp:
-            return f"Pinged {url} -> {resp.status}"
-    except Exception as exc:
-        logger.warning("Ping to %s failed: %s", url, exc)
-        return f"Ping failed: {exc}"
+    payments = Payment.objects.select_related("learner", "course").filter(id__in=payment_ids)
+    sent = _send_batch([_payment_receipt_message(payment) for payment in payments])
+    return f"Sent {sent} payment receipts"
+
+
+@shared_task
+def send_enrollment_notifications(enrollment_ids: list[int]):
+    """Bulk variant of send_enrollment_notification."""
+    enrollments = Enrollment.objects.select_related("learner", "course").filter(
+        id__in=enrollment_ids
+    )
+    sent = _send_batch([_enrollment_message(enrollment) for enrollment in enrollments])
+    return f"Sent {sent} enrollment notifications"
+
+
+@shared_task
+def relay_notification_outbox():
+    from notifications.outbox import relay_outbox
+
+    return f"Relayed {relay_outbox()} notifications"
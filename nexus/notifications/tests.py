@@ -1,3 +1,145 @@
+from unittest import mock
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import transaction
 from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from courses.models import Course, Enrollment
+from payments.models import Payment
+from users.models import User
+from . import tasks
+from .models import OutboxMessage
+from .outbox import enqueue_notifications, relay_outbox
+
+
+class OutboxTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        teacher = User.objects.create_user("teacher@example.com", "password", role=User.Role.TEACHER)
+        cls.learner = User.objects.create_user("learner@example.com", "password", role=User.Role.LEARNER)
+        cls.course = Course.objects.create(
+            teacher=teacher, title="Course", description="", price=10, is_published=True
+        )
+
+    def outbox(self):
+        return sorted(OutboxMessage.objects.values_list("kind", "object_id"))
+
+    def test_messages_are_written_with_the_change(self):
+        self.client.force_authenticate(self.learner)
+        response = self.client.post("/v1/payments/", {"course_id": self.course.id, "amount": "10"})
+        self.assertEqual(response.status_code, 201)
+        enrollment = Enrollment.objects.get(learner=self.learner, course=self.course)
+        self.assertEqual(
+            self.outbox(),
+            [
+                (OutboxMessage.Kind.ENROLLMENT, enrollment.id),
+                (OutboxMessage.Kind.PAYMENT_RECEIPT, response.data["id"]),
+            ],
+        )
+
+    def test_a_failed_outbox_write_rolls_the_change_back(self):
+        self.client.force_authenticate(self.learner)
+        with mock.patch.object(OutboxMessage.objects, "bulk_create", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.post("/v1/payments/", {"course_id": self.course.id, "amount": "10"})
+        self.assertFalse(Payment.objects.exists())
+        self.assertFalse(Enrollment.objects.exists())
+
+    def test_rollback_drops_the_messages(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            enrollment = Enrollment.objects.create(learner=self.learner, course=self.course)
+            enqueue_notifications([(OutboxMessage.Kind.ENROLLMENT, enrollment.id)])
+            raise RuntimeError
+        self.assertEqual(self.outbox(), [])
+
+    @mock.patch.object(tasks, "send_enrollment_notifications")
+    @mock.patch.object(tasks, "send_payment_receipts")
+    def test_relay_sends_each_message_once(self, send_receipts, send_enrollments):
+        enqueue_notifications(
+            [
+                (OutboxMessage.Kind.PAYMENT_RECEIPT, 1),
+                (OutboxMessage.Kind.ENROLLMENT, 7),
+                (OutboxMessage.Kind.ENROLLMENT, 7),
+                (OutboxMessage.Kind.ENROLLMENT, 8),
+            ]
+        )
+        self.assertEqual(relay_outbox(batch_size=3), 4)
+        sent = [ids for call in send_enrollments.delay.call_args_list for ids in call.args[0]]
+        self.assertEqual(sorted(sent), [7, 8])
+        send_receipts.delay.assert_called_once_with([1])
+        self.assertEqual(self.outbox(), [])
+
+        # Nothing is left to send twice.
+        self.assertEqual(relay_outbox(), 0)
+        self.assertEqual(send_receipts.delay.call_count, 1)
+
+    @mock.patch.object(tasks, "send_payment_receipts")
+    def test_failed_relay_keeps_the_message(self, send_receipts):
+        enqueue_notifications([(OutboxMessage.Kind.PAYMENT_RECEIPT, 1)])
+        send_receipts.delay.side_effect = ConnectionError
+        with self.assertLogs("notifications.outbox", "WARNING"):
+            self.assertEqual(relay_outbox(), 0)
+        self.assertEqual(OutboxMessage.objects.get().attempts, 1)
+
+        send_receipts.delay.side_effect = None
+        self.assertEqual(relay_outbox(), 1)
+        send_receipts.delay.assert_called_with([1])
+        self.assertEqual(self.outbox(), [])
+
+
+class BulkMailTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        teacher = User.objects.create_user("teacher@example.com", "password", role=User.Role.TEACHER)
+        course = Course.objects.create(
+            teacher=teacher, title="Course", description="", price=10, is_published=True
+        )
+        learners = [
+            User.objects.create_user(f"learner{i}@example.com", "password", role=User.Role.LEARNER)
+            for i in range(3)
+        ]
+        cls.emails = [[learner.email] for learner in learners]
+        cls.payments = [
+            Payment.objects.create(learner=learner, course=course, amount=10).id for learner in learners
+        ]
+        cls.enrollments = [
+            Enrollment.objects.create(learner=learner, course=course).id for learner in learners
+        ]
+
+    def send(self, task, ids):
+        """Run `task` on `ids`, asserting it loads them in one query over one connection."""
+        with (
+            mock.patch.object(tasks, "get_connection", wraps=tasks.get_connection) as get_connection,
+            mock.patch.object(
+                EmailBackend, "send_messages", autospec=True, side_effect=EmailBackend.send_messages
+            ) as send_messages,
+            self.assertNumQueries(1),
+        ):
+            result = task(ids)
+        get_connection.assert_called_once()
+        send_messages.assert_called_once()
+        return result
+
+    def test_payment_receipts_are_sent_in_one_batch(self):
+        result = self.send(tasks.send_payment_receipts, self.payments)
+        self.assertEqual(result, "Sent 3 payment receipts")
+        self.assertEqual(sorted(message.to for message in mail.outbox), self.emails)
+        self.assertTrue(all(message.subject == "Payment receipt for Course" for message in mail.outbox))
+
+    def test_enrollment_notifications_are_sent_in_one_batch(self):
+        result = self.send(tasks.send_enrollment_notifications, self.enrollments)
+        self.assertEqual(result, "Sent 3 enrollment notifications")
+        self.assertEqual(sorted(message.to for message in mail.outbox), self.emails)
+
+    def test_missing_ids_are_skipped(self):
+        Payment.objects.filter(id=self.payments[0]).delete()
+        result = self.send(tasks.send_payment_receipts, self.payments + [0])
+        self.assertEqual(result, "Sent 2 payment receipts")
+        self.assertEqual(sorted(message.to for message in mail.outbox), self.emails[1:])
 
-# Create your tests here.
+        # Nothing left to send opens no connection.
+        with mock.patch.object(tasks, "get_connection") as get_connection, self.assertNumQueries(1):
+            self.assertEqual(tasks.send_enrollment_notifications([0]), "Sent 0 enrollment notifications")
+        get_connection.assert_not_called()
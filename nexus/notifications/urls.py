@@ -1,7 +1,11 @@
-from django.urls import path
-from .views import health_check, welcome
+from django.urls import path, re_path
+from .views import health_check, health_live, health_ready, metrics, welcome
 
 urlpatterns = [
     path("welcome/", welcome, name="welcome"),
     path("health/", health_check, name="health"),
+    # Probes may not follow APPEND_SLASH redirects, so both spellings match.
+    re_path(r"^health/live/?$", health_live, name="health-live"),
+    re_path(r"^health/ready/?$", health_ready, name="health-ready"),
+    path("metrics/", metrics, name="metrics"),
 ]
@@ -1,7 +1,14 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
 from rest_framework.decorators import api_view, permission_classes, authentication_classes
+from rest_framework.exceptions import NotAuthenticated, PermissionDenied
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from drf_yasg.utils import swagger_auto_schema
+
+from nexus import health
+from nexus.docs import swagger_auto_schema
+from nexus.profiling import CONTENT_TYPE, render_metrics
 
 
 @swagger_auto_schema(method="get", tags=["System"], operation_summary="Welcome message")
@@ -18,3 +25,43 @@ def welcome(request):
 @permission_classes([AllowAny])
 def health_check(request):
     return Response({"status": "Nexus backend running"})
+
+
+@swagger_auto_schema(method="get", tags=["System"], operation_summary="Liveness probe")
+@api_view(["GET"])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def health_live(request):
+    # No I/O: a worker that can run this view is alive.
+    return Response({"status": "alive"})
+
+
+@swagger_auto_schema(
+    method="get",
+    tags=["System"],
+    operation_summary="Readiness probe",
+    operation_description=(
+        "Database, cache and broker checks, cached for a few seconds. "
+        "503 when a required dependency is unavailable."
+    ),
+)
+@api_view(["GET"])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def health_ready(request):
+    report = health.readiness()
+    return Response(report, status=503 if report["status"] == "unavailable" else 200)
+
+
+@swagger_auto_schema(method="get", tags=["System"], operation_summary="Prometheus metrics")
+@api_view(["GET"])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def metrics(request):
+    token = settings.METRICS_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            raise PermissionDenied("Set METRICS_TOKEN to enable metrics.")
+    elif not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        raise NotAuthenticated()
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE)
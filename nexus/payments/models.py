@@ -34,6 +34,16 @@ class Payment(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["learner", "-created_at", "-id"], name="payment_learner_created_idx"
+            ),
+            models.Index(
+                fields=["course", "-created_at", "-id"], name="payment_course_created_idx"
+            ),
+            # Incremental analytics rollups scan rows changed since a watermark.
+            models.Index(fields=["updated_at"], name="payment_updated_idx"),
+        ]
 
     def __str__(self):
         return f"{self.reference} - {self.status}"
@@ -1,14 +1,18 @@
 from uuid import uuid4
 
+from django.db import transaction
 from rest_framework import serializers
 
+from courses.counters import refresh_active_enrollments
 from courses.models import Course, Enrollment
 from courses.serializers import CourseSerializer
+from nexus.fieldsets import SparseFieldsetMixin
+from notifications.models import OutboxMessage
+from notifications.outbox import enqueue_notifications
 from .models import Payment
 
 
-class PaymentSerializer(serializers.ModelSerializer):
-    course = CourseSerializer(read_only=True)
+class PaymentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     course_id = serializers.PrimaryKeyRelatedField(
         queryset=Course.objects.filter(is_published=True),
         source="course",
@@ -17,6 +21,7 @@ class PaymentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Payment
+        expandable_fields = {"course": CourseSerializer}
         fields = [
             "id",
             "course",
@@ -39,6 +44,7 @@ class PaymentSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
 
+    @transaction.atomic
     def create(self, validated_data):
         request = self.context["request"]
         user = request.user
@@ -52,25 +58,25 @@ class PaymentSerializer(serializers.ModelSerializer):
             amount=amount,
             provider=provider,
             status=Payment.Status.SUCCESS,
-            reference=str(uuid4()),
+            reference=validated_data.get("reference") or str(uuid4()),
             metadata={"note": "Simulated payment success"},
         )
 
-        enrollment, _ = Enrollment.objects.get_or_create(
-            learner=user, course=course, defaults={"status": Enrollment.Status.ACTIVE}
+        # Single INSERT ... ON CONFLICT DO UPDATE instead of get_or_create + save.
+        (enrollment,) = Enrollment.objects.bulk_create(
+            [Enrollment(learner=user, course=course, status=Enrollment.Status.ACTIVE)],
+            update_conflicts=True,
+            unique_fields=["learner", "course"],
+            update_fields=["status", "updated_at"],
         )
-        enrollment.status = Enrollment.Status.ACTIVE
-        enrollment.save(update_fields=["status", "updated_at"])
+        # The upsert doesn't report the previous status, so recount instead of adjusting.
+        refresh_active_enrollments(course.id)
 
-        # Trigger async notification
-        try:
-            from notifications.tasks import send_payment_receipt
-            from notifications.tasks import send_enrollment_notification
-
-            send_payment_receipt.delay(payment.id)
-            send_enrollment_notification.delay(enrollment.id)
-        except Exception:
-            # Fail silently; payment should not fail because email failed.
-            pass
+        enqueue_notifications(
+            [
+                (OutboxMessage.Kind.PAYMENT_RECEIPT, payment.id),
+                (OutboxMessage.Kind.ENROLLMENT, enrollment.id),
+            ]
+        )
 
         return payment
@@ -1,3 +1,91 @@
-from django.test import TestCase
+from unittest import skipUnless
 
-# Create your tests here.
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from courses.models import Course
+from users.models import User
+from .models import Payment
+
+
+@skipUnless(connection.vendor == "sqlite", "Plans are asserted against SQLite's EXPLAIN QUERY PLAN.")
+class PaymentListIndexTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        teacher = User.objects.create_user("teacher@example.com", "password", role=User.Role.TEACHER)
+        cls.learner = User.objects.create_user("learner@example.com", "password", role=User.Role.LEARNER)
+        course = Course.objects.create(teacher=teacher, title="Course", description="", is_published=True)
+        Payment.objects.create(learner=cls.learner, course=course, amount=10)
+
+    def test_learner_payments(self):
+        self.client.force_authenticate(self.learner)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/v1/payments/")
+        self.assertEqual(response.status_code, 200)
+        sql = next(q["sql"] for q in ctx.captured_queries if 'FROM "payments_payment"' in q["sql"])
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            plan = " / ".join(row[-1] for row in cursor.fetchall())
+        self.assertIn("payment_learner_created_idx", plan)
+
+
+class IdempotentPaymentTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        teacher = User.objects.create_user("teacher@example.com", "password", role=User.Role.TEACHER)
+        cls.learner = User.objects.create_user("learner@example.com", "password", role=User.Role.LEARNER)
+        cls.course = Course.objects.create(
+            teacher=teacher, title="Course", description="", price=40, is_published=True
+        )
+        cls.other_course = Course.objects.create(
+            teacher=teacher, title="Other", description="", price=40, is_published=True
+        )
+
+    def pay(self, body, key=None, user=None):
+        self.client.force_authenticate(user or self.learner)
+        headers = {"Idempotency-Key": key} if key is not None else {}
+        return self.client.post("/v1/payments/", body, headers=headers)
+
+    def test_retry_with_the_same_key_replays_the_payment(self):
+        first = self.pay({"course_id": self.course.id, "amount": "40"}, key="checkout-1")
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(first.data["reference"], "checkout-1")
+        self.assertNotIn("Idempotent-Replayed", first)
+
+        # Spelling out the default provider still asks for the same payment.
+        retry = self.pay(
+            {"course_id": self.course.id, "amount": "40.00", "provider": "mock"}, key="checkout-1"
+        )
+        self.assertEqual((retry.status_code, retry["Idempotent-Replayed"]), (201, "true"))
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(Payment.objects.filter(reference="checkout-1").count(), 1)
+
+    def test_same_key_with_a_different_body_conflicts(self):
+        self.pay({"course_id": self.course.id, "amount": "40"}, key="checkout-1")
+        for body in (
+            {"course_id": self.other_course.id, "amount": "40"},
+            {"course_id": self.course.id, "amount": "15"},
+            {"course_id": self.course.id, "amount": "40", "provider": "stripe"},
+        ):
+            with self.subTest(body=body):
+                response = self.pay(body, key="checkout-1")
+                self.assertEqual(response.status_code, 409)
+                self.assertEqual(response.data["detail"].code, "idempotency_conflict")
+
+        other = User.objects.create_user("other@example.com", "password", role=User.Role.LEARNER)
+        response = self.pay({"course_id": self.course.id, "amount": "40"}, key="checkout-1", user=other)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Payment.objects.count(), 1)
+
+    def test_requests_without_a_key_always_create(self):
+        first = self.pay({"course_id": self.course.id, "amount": "40"})
+        second = self.pay({"course_id": self.course.id, "amount": "40"})
+        self.assertEqual((first.status_code, second.status_code), (201, 201))
+        self.assertNotEqual(first.data["reference"], second.data["reference"])
+        self.assertEqual(Payment.objects.count(), 2)
+
+    def test_key_length_is_validated(self):
+        response = self.pay({"course_id": self.course.id, "amount": "40"}, key="x" * 65)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Payment.objects.exists())
@@ -1,31 +1,127 @@
-from rest_framework import permissions, viewsets
-from rest_framework.exceptions import PermissionDenied
-from drf_yasg.utils import swagger_auto_schema
+from decimal import Decimal, InvalidOperation
 
+from django.db import IntegrityError
+from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, PermissionDenied, ValidationError
+from rest_framework.response import Response
+
+from nexus.exports import EXPORT_RENDERERS, export_response
+from nexus.fieldsets import load_rendered_relations
+from nexus.pagination import CreatedAtCursorPagination
+from nexus.replicas import ReplicaReadMixin
 from users.permissions import IsLearner
 from .models import Payment
 from .serializers import PaymentSerializer
 
 
-class PaymentViewSet(viewsets.ModelViewSet):
+class IdempotencyConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "This Idempotency-Key was already used for a different payment."
+    default_code = "idempotency_conflict"
+
+
+class PaymentViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     swagger_tags = ["Payments"]
     serializer_class = PaymentSerializer
+    pagination_class = CreatedAtCursorPagination
     http_method_names = ["get", "post", "head", "options"]
 
     def get_permissions(self):
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "export"]:
             return [permissions.IsAuthenticated()]
         return [permissions.IsAuthenticated(), IsLearner()]
 
     def get_queryset(self):
         user = self.request.user
-        qs = Payment.objects.select_related("course", "learner", "course__teacher")
+        qs = load_rendered_relations(Payment.objects.all(), self.get_serializer())
         if getattr(user, "role", None) == "TEACHER":
             return qs.filter(course__teacher=user)
         return qs.filter(learner=user)
 
+    @action(detail=False, methods=["get"], renderer_classes=EXPORT_RENDERERS)
+    def export(self, request):
+        """Stream every visible payment as CSV or NDJSON, optionally for one `?course=`."""
+        queryset = self.get_queryset().order_by("-created_at", "-id")
+        course = request.query_params.get("course")
+        if course is not None:
+            if not course.isdigit():
+                raise ValidationError({"course": "Must be a course id."})
+            queryset = queryset.filter(course_id=course)
+        return export_response(
+            request,
+            queryset,
+            {
+                "id": "id",
+                "reference": "reference",
+                "created_at": "created_at",
+                "status": "status",
+                "amount": "amount",
+                "provider": "provider",
+                "course_id": "course_id",
+                "course_title": "course__title",
+                "learner_id": "learner_id",
+                "learner_email": "learner__email",
+            },
+            "payments",
+        )
+
+    def get_idempotency_key(self):
+        key = self.request.headers.get("Idempotency-Key")
+        if key is not None and not 0 < len(key) <= Payment._meta.get_field("reference").max_length:
+            raise ValidationError({"Idempotency-Key": "Must be between 1 and 64 characters."})
+        return key
+
+    def is_retry_of(self, payment):
+        """Whether the request asks for exactly the payment `payment` records."""
+        data = self.request.data
+        if payment.learner_id != self.request.user.id or str(payment.course_id) != str(
+            data.get("course_id")
+        ):
+            return False
+        try:
+            amount = Decimal(str(data.get("amount")))
+        except InvalidOperation:
+            return False
+        provider = data.get("provider") or Payment._meta.get_field("provider").default
+        return amount == payment.amount and provider == payment.provider
+
+    def replay(self, key):
+        """Return the original response for a payment already created with `key`."""
+        payment = (
+            load_rendered_relations(Payment.objects.all(), self.get_serializer())
+            .filter(reference=key)
+            .first()
+        )
+        if payment is None:
+            return None
+        if not self.is_retry_of(payment):
+            raise IdempotencyConflict()
+        serializer = self.get_serializer(payment)
+        return Response(
+            serializer.data,
+            status=status.HTTP_201_CREATED,
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    def create(self, request, *args, **kwargs):
+        key = self.get_idempotency_key()
+        if key is None:
+            return super().create(request, *args, **kwargs)
+        response = self.replay(key)
+        if response is not None:
+            return response
+        try:
+            return super().create(request, *args, **kwargs)
+        except IntegrityError:
+            # A concurrent retry with the same key committed first.
+            response = self.replay(key)
+            if response is None:
+                raise
+            return response
+
     def perform_create(self, serializer):
         user = self.request.user
         if getattr(user, "role", None) != "LEARNER":
             raise PermissionDenied("Only learners can initiate payments.")
-        serializer.save()
+        serializer.save(reference=self.get_idempotency_key())
@@ -0,0 +1,31 @@
+from django.core.cache import caches
+from rest_framework.authentication import TokenAuthentication
+
+from .models import User
+from .token_cache import CACHE_ALIAS, remember_token, token_cache_key
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that keeps a snapshot of the token's user (see
+    users.token_cache) in the "auth" cache, so a warm request needs no query.
+
+    Cache hits return a User with only the snapshot fields loaded; the first
+    access to any other field loads the rest (see User.refresh_from_db).
+    Snapshots are dropped when the token is revoked or the user is saved (see
+    users.signals) and otherwise expire with the cache TIMEOUT.
+    """
+
+    def authenticate_credentials(self, key):
+        snapshot = caches[CACHE_ALIAS].get(token_cache_key(key))
+        if snapshot is None:
+            user, token = super().authenticate_credentials(key)
+            remember_token(key, user)
+            return user, token
+
+        # from_db() expects the loaded values in concrete field order.
+        names = [f.attname for f in User._meta.concrete_fields if f.attname in snapshot]
+        user = User.from_db(User.objects.db, names, [snapshot[name] for name in names])
+        token = self.get_model()(key=key, user=user)
+        token._state.adding = False
+        return user, token
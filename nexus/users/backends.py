@@ -0,0 +1,33 @@
+from django.contrib.auth import backends, get_user_model, hashers
+
+from .hashers import run_hasher
+
+UserModel = get_user_model()
+
+
+class ModelBackend(backends.ModelBackend):
+    """
+    Django's ModelBackend with an async path that hashes on the password
+    hashing pool (users.hashers.run_hasher) and saves an upgraded hash with
+    the async ORM. The sync path is unchanged.
+    """
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = await UserModel._default_manager.aget_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash anyway so the response time doesn't reveal unknown accounts.
+            await run_hasher(UserModel().set_password, password)
+            return None
+
+        is_correct, must_update = await run_hasher(hashers.verify_password, password, user.password)
+        if not is_correct or not self.user_can_authenticate(user):
+            return None
+        if must_update:
+            await run_hasher(user.set_password, password)
+            await user.asave(update_fields=["password"])
+        return user
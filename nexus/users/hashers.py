@@ -0,0 +1,37 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+# The stock hashers with their cost taken from settings. Django rehashes a
+# password on the next successful login whenever its stored cost differs,
+# so raising or lowering a cost needs no migration.
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    iterations = settings.PBKDF2_ITERATIONS or hashers.PBKDF2PasswordHasher.iterations
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    work_factor = settings.SCRYPT_WORK_FACTOR or hashers.ScryptPasswordHasher.work_factor
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Needs the argon2-cffi package."""
+
+    time_cost = settings.ARGON2_TIME_COST or hashers.Argon2PasswordHasher.time_cost
+    memory_cost = settings.ARGON2_MEMORY_COST or hashers.Argon2PasswordHasher.memory_cost
+
+
+# Hashing is CPU bound and the hash functions release the GIL, so a small
+# dedicated pool lets logins (users.backends) proceed in parallel without
+# taking over the event loop or the thread that runs sync views under ASGI.
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+
+
+async def run_hasher(func, *args):
+    """Run `func(*args)` on the password hashing pool."""
+    return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
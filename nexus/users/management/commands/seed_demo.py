@@ -6,6 +6,8 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 from rest_framework.authtoken.models import Token
 
+from courses.counters import recompute_counters
+from courses.search import get_backend
 from courses.models import Course, Lesson, Enrollment, CourseReview, TeacherReview
 from payments.models import Payment
 
@@ -147,5 +149,8 @@ class Command(BaseCommand):
                     },
                 )
 
+        recompute_counters()
+        get_backend().rebuild()
+
         self.stdout.write(self.style.SUCCESS("Seeding complete."))
         self.stdout.write(self.style.SUCCESS(f"Test password for all users: {PASSWORD}"))
@@ -0,0 +1,242 @@
+import random
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.authtoken.models import Token
+
+from courses.counters import recompute_counters
+from courses.models import Course, Lesson, Enrollment, CourseReview, TeacherReview
+from courses.search import get_backend
+from payments.models import Payment
+
+PASSWORD = "password"
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a large, deterministic dataset for load testing. Rows are "
+        "written with bulk_create in chunks and every user shares one "
+        "precomputed password hash."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--teachers", type=int, default=100)
+        parser.add_argument("--learners", type=int, default=10000)
+        parser.add_argument(
+            "--courses", type=int, default=1000, help="Total courses, spread over teachers."
+        )
+        parser.add_argument("--lessons-per-course", type=int, default=20)
+        parser.add_argument(
+            "--enrollments-per-learner",
+            type=int,
+            default=5,
+            help="ACTIVE enrollments (each with a successful payment) per learner.",
+        )
+        parser.add_argument(
+            "--reviews",
+            type=int,
+            default=2,
+            help="Course reviews per learner, plus one teacher review per distinct teacher reviewed.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Random seed; same seed, same data."
+        )
+        parser.add_argument(
+            "--prefix", default="scale", help="Namespaces emails and payment references."
+        )
+        parser.add_argument(
+            "--skip-index", action="store_true", help="Don't rebuild the search index."
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        self.chunk_size = options["chunk_size"]
+        self.rng = random.Random(options["seed"])
+        self.timings = []
+        prefix = options["prefix"]
+
+        if options["teachers"] < 1 or options["courses"] < 1:
+            raise CommandError("At least one teacher and one course are required.")
+        if options["enrollments_per_learner"] > options["courses"]:
+            raise CommandError("--enrollments-per-learner cannot exceed --courses.")
+        if User.objects.filter(email__startswith=f"{prefix}-").exists():
+            raise CommandError(f"Prefix '{prefix}' was already seeded; pass a different --prefix.")
+
+        password = make_password(PASSWORD)
+
+        teacher_ids = self.create(
+            "teachers",
+            User,
+            options["teachers"],
+            lambda i: User(
+                email=f"{prefix}-teacher{i}@example.com",
+                role=User.Role.TEACHER,
+                password=password,
+                first_name="Teacher",
+                last_name=str(i),
+            ),
+        )
+        learner_ids = self.create(
+            "learners",
+            User,
+            options["learners"],
+            lambda i: User(
+                email=f"{prefix}-learner{i}@example.com",
+                role=User.Role.LEARNER,
+                password=password,
+                first_name="Learner",
+                last_name=str(i),
+            ),
+        )
+        user_ids = teacher_ids + learner_ids
+        self.create(
+            "tokens",
+            Token,
+            len(user_ids),
+            lambda i: Token(user_id=user_ids[i], key=Token.generate_key()),
+            return_ids=False,
+        )
+
+        course_teachers = [teacher_ids[i % len(teacher_ids)] for i in range(options["courses"])]
+        course_ids = self.create(
+            "courses",
+            Course,
+            options["courses"],
+            lambda i: Course(
+                teacher_id=course_teachers[i],
+                title=f"Course {i}",
+                description=f"Generated course {i} for load testing.",
+                price=Decimal(self.rng.randrange(0, 20000)) / 100,
+                is_published=self.rng.random() < 0.9,
+            ),
+        )
+
+        per_course = options["lessons_per_course"]
+        self.create(
+            "lessons",
+            Lesson,
+            len(course_ids) * per_course,
+            lambda i: Lesson(
+                course_id=course_ids[i // per_course],
+                title=f"Lesson {i % per_course + 1}",
+                video_url=f"https://videos.example.com/{course_ids[i // per_course]}/{i % per_course + 1}",
+                position=i % per_course + 1,
+            ),
+            return_ids=False,
+        )
+
+        # Pick each learner's courses once so enrollments, payments and reviews agree.
+        per_learner = options["enrollments_per_learner"]
+        picks = [
+            self.rng.sample(range(len(course_ids)), per_learner) for _ in range(len(learner_ids))
+        ]
+        self.create(
+            "enrollments",
+            Enrollment,
+            len(learner_ids) * per_learner,
+            lambda i: Enrollment(
+                learner_id=learner_ids[i // per_learner],
+                course_id=course_ids[picks[i // per_learner][i % per_learner]],
+                status=Enrollment.Status.ACTIVE,
+            ),
+            return_ids=False,
+        )
+        self.create(
+            "payments",
+            Payment,
+            len(learner_ids) * per_learner,
+            lambda i: Payment(
+                learner_id=learner_ids[i // per_learner],
+                course_id=course_ids[picks[i // per_learner][i % per_learner]],
+                amount=Decimal("49.00"),
+                status=Payment.Status.SUCCESS,
+                reference=f"{prefix}-{i}",
+                metadata={"seeded": True},
+            ),
+            return_ids=False,
+        )
+
+        per_review = min(options["reviews"], per_learner)
+        self.create(
+            "course reviews",
+            CourseReview,
+            len(learner_ids) * per_review,
+            lambda i: CourseReview(
+                learner_id=learner_ids[i // per_review],
+                course_id=course_ids[picks[i // per_review][i % per_review]],
+                rating=self.rng.randint(1, 5),
+                comment="Generated review.",
+            ),
+            return_ids=False,
+        )
+        teacher_reviews = [
+            (learner_ids[n], teacher_id)
+            for n, picked in enumerate(picks)
+            for teacher_id in dict.fromkeys(course_teachers[c] for c in picked[:per_review])
+        ]
+        self.create(
+            "teacher reviews",
+            TeacherReview,
+            len(teacher_reviews),
+            lambda i: TeacherReview(
+                learner_id=teacher_reviews[i][0],
+                teacher_id=teacher_reviews[i][1],
+                rating=self.rng.randint(1, 5),
+                comment="Generated review.",
+            ),
+            return_ids=False,
+        )
+
+        self.timed("counters", recompute_counters)
+        if not options["skip_index"]:
+            self.timed("search index", lambda: get_backend().rebuild())
+
+        self.report()
+        self.stdout.write(self.style.SUCCESS(f"Test password for all users: {PASSWORD}"))
+
+    def create(self, label, model, total, build, return_ids=True):
+        """bulk_create `total` rows built by `build(i)`, one chunk at a time."""
+        ids = []
+        start = time.perf_counter()
+        for offset in range(0, total, self.chunk_size):
+            chunk = [build(i) for i in range(offset, min(offset + self.chunk_size, total))]
+            created = model.objects.bulk_create(chunk)
+            if return_ids:
+                ids.extend(obj.pk for obj in created)
+            done = offset + len(chunk)
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"  {label}: {done}/{total} ({done / elapsed:,.0f} rows/s)", ending="\r"
+            )
+            self.stdout.flush()
+        elapsed = time.perf_counter() - start
+        self.timings.append((label, total, elapsed))
+        self.stdout.write(self.style.SUCCESS(f"{label}: {total} rows in {elapsed:.1f}s"))
+        return ids
+
+    def timed(self, label, func):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        self.timings.append((label, None, elapsed))
+        self.stdout.write(self.style.SUCCESS(f"{label}: rebuilt in {elapsed:.1f}s"))
+
+    def report(self):
+        total_rows = sum(rows or 0 for _, rows, _ in self.timings)
+        total_time = sum(elapsed for _, _, elapsed in self.timings)
+        self.stdout.write(f"\n{'step':<18}{'rows':>12}{'seconds':>10}{'rows/s':>12}")
+        for label, rows, elapsed in self.timings:
+            rate = f"{rows / elapsed:,.0f}" if rows and elapsed else "-"
+            self.stdout.write(
+                f"{label:<18}{rows if rows is not None else '-':>12}{elapsed:>10.1f}{rate:>12}"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {total_rows:,} rows in {total_time:.1f}s "
+                f"({total_rows / total_time if total_time else 0:,.0f} rows/s)."
+            )
+        )
@@ -44,6 +44,9 @@ class User(AbstractUser):
         choices=Role.choices,
         default=Role.LEARNER,
     )
+    # Denormalized TeacherReview totals, maintained by courses.counters.
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
@@ -53,4 +56,20 @@ class User(AbstractUser):
     def __str__(self) -> str:
         return f"{self.email} ({self.role})"
 
+    @property
+    def average_rating(self):
+        if not self.rating_count:
+            return None
+        return round(self.rating_sum / self.rating_count, 2)
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        # Users authenticated from the token cache only carry a snapshot;
+        # touching any other field loads all of them in one query.
+        if fields is not None:
+            fields = set(fields)
+            deferred = self.get_deferred_fields()
+            if fields & deferred:
+                fields |= deferred
+        super().refresh_from_db(using, fields, **kwargs)
+
 # Create your models here.
@@ -1,15 +1,28 @@
-from django.contrib.auth import authenticate
+from django.contrib.auth import aauthenticate
 from rest_framework import serializers
 from rest_framework.authtoken.models import Token
+from rest_framework.settings import api_settings
 
+from nexus.fieldsets import SparseFieldsetMixin
 from .models import User
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    average_rating = serializers.FloatField(read_only=True)
+
     class Meta:
         model = User
-        fields = ["id", "email", "role", "first_name", "last_name", "date_joined"]
-        read_only_fields = ["id", "role", "date_joined"]
+        fields = [
+            "id",
+            "email",
+            "role",
+            "first_name",
+            "last_name",
+            "average_rating",
+            "rating_count",
+            "date_joined",
+        ]
+        read_only_fields = ["id", "role", "average_rating", "rating_count", "date_joined"]
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -28,25 +41,27 @@ class RegisterSerializer(serializers.ModelSerializer):
         return user
 
     def get_token(self, obj):
-        token, _ = Token.objects.get_or_create(user=obj)
-        return token.key
+        # Token.objects.create() in create() already cached the reverse relation.
+        return obj.auth_token.key
 
 
 class EmailAuthTokenSerializer(serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField(style={"input_type": "password"})
 
-    def validate(self, attrs):
-        email = attrs.get("email")
-        password = attrs.get("password")
-
-        if email and password:
-            user = authenticate(request=self.context.get("request"), email=email, password=password)
-            if not user:
-                msg = "Unable to log in with provided credentials."
-                raise serializers.ValidationError(msg, code="authorization")
-        else:
-            raise serializers.ValidationError("Must include 'email' and 'password'.", code="authorization")
-
-        attrs["user"] = user
-        return attrs
+    async def aauthenticate(self):
+        """
+        Return the user for the validated credentials. Kept out of validate()
+        so the password check can be awaited (see users.backends).
+        """
+        user = await aauthenticate(
+            self.context.get("request"),
+            email=self.validated_data["email"],
+            password=self.validated_data["password"],
+        )
+        if not user:
+            msg = "Unable to log in with provided credentials."
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [msg]}, code="authorization"
+            )
+        return user
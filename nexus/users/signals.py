@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .token_cache import SNAPSHOT_FIELDS, invalidate_tokens, invalidate_user_tokens
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def drop_cached_user_tokens(sender, instance, created, update_fields=None, **kwargs):
+    # Only saves that may touch a snapshot field (role, is_active, ...) count;
+    # login stamps and password rehashes don't.
+    if created or (update_fields is not None and not update_fields & set(SNAPSHOT_FIELDS)):
+        return
+    invalidate_user_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=Token)
+def drop_cached_token(sender, instance, **kwargs):
+    invalidate_tokens(instance.key)
@@ -1,3 +1,105 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import hashers, user_login_failed
+from django.core.cache import cache, caches
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from .models import User
+from .throttles import LoginEmailRateThrottle, LoginIPRateThrottle
+from .token_cache import CACHE_ALIAS, token_cache_key
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    def setUp(self):
+        caches[CACHE_ALIAS].clear()
+        self.user = User.objects.create_user("learner@example.com", "password", role=User.Role.LEARNER)
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def profile(self):
+        return self.client.get("/v1/users/profile/")
+
+    def warm(self):
+        self.assertEqual(self.profile().status_code, 200)
+        self.assertIsNotNone(caches[CACHE_ALIAS].get(token_cache_key(self.token.key)))
+
+    def test_deactivation_applies_to_the_next_request(self):
+        self.warm()
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+        self.assertEqual(self.profile().status_code, 401)
+
+    def test_role_change_applies_to_the_next_request(self):
+        self.warm()
+        course = {"title": "Course", "description": "About", "price": "10"}
+        self.assertEqual(self.client.post("/v1/courses/", course).status_code, 403)
+
+        self.user.role = User.Role.TEACHER
+        self.user.save()
+        self.assertEqual(self.profile().data["role"], User.Role.TEACHER)
+        self.assertEqual(self.client.post("/v1/courses/", course).status_code, 201)
+
+    def test_logout_applies_to_the_next_request(self):
+        self.warm()
+        self.assertEqual(self.client.post("/v1/users/logout/").status_code, 204)
+        self.assertEqual(self.profile().status_code, 401)
+        self.assertFalse(Token.objects.filter(user=self.user).exists())
+
+
+class LoginTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("learner@example.com", "password", role=User.Role.LEARNER)
+
+    def login(self, password="password", email="learner@example.com"):
+        return self.client.post("/v1/users/login/", {"email": email, "password": password})
+
+    def test_login_upgrades_an_outdated_hash(self):
+        hasher = hashers.get_hasher()
+        outdated = hasher.encode("password", hasher.salt(), iterations=1000)
+        User.objects.filter(pk=self.user.pk).update(password=outdated)
+
+        response = self.login()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["token"], Token.objects.get(user=self.user).key)
+        self.user.refresh_from_db()
+        self.assertNotEqual(self.user.password, outdated)
+        self.assertFalse(hasher.must_update(self.user.password))
+        self.assertTrue(self.user.check_password("password"))
+
+    def test_failed_logins_signal_and_inactive_users_are_refused(self):
+        failures = []
+
+        def handler(sender, credentials, **kwargs):
+            failures.append(credentials["email"])
+
+        user_login_failed.connect(handler)
+        self.addCleanup(user_login_failed.disconnect, handler)
+
+        self.assertEqual(self.login(password="wrong").status_code, 400)
+        self.assertEqual(self.login(email="nobody@example.com").status_code, 400)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.login().status_code, 400)
+        self.assertEqual(failures, ["learner@example.com", "nobody@example.com", "learner@example.com"])
+
+    def test_attempts_per_email_are_throttled(self):
+        rates = {"login_email": "2/min", "login_ip": "100/min"}
+        with mock.patch.object(LoginEmailRateThrottle, "THROTTLE_RATES", rates), mock.patch.object(
+            LoginIPRateThrottle, "THROTTLE_RATES", rates
+        ):
+            self.assertEqual(self.login(password="wrong").status_code, 400)
+            self.assertEqual(self.login(password="wrong").status_code, 400)
+            # The right password doesn't help once the account's budget is spent.
+            response = self.login()
+            self.assertEqual(response.status_code, 429)
+            self.assertIn("Retry-After", response)
+            # Other accounts from the same address are unaffected.
+            self.assertEqual(self.login(email="other@example.com").status_code, 400)
+
+    def test_non_object_body_is_a_validation_error(self):
+        for body in (["learner@example.com"], "learner@example.com", 1):
+            with self.subTest(body=body):
+                response = self.client.post("/v1/users/login/", body, format="json")
+                self.assertEqual(response.status_code, 400)
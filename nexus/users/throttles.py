@@ -0,0 +1,29 @@
+import hashlib
+from collections.abc import Mapping
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class LoginIPRateThrottle(SimpleRateThrottle):
+    """Login attempts per client IP, whichever account they target."""
+
+    scope = "login_ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class LoginEmailRateThrottle(SimpleRateThrottle):
+    """Login attempts per account, whichever IP they come from."""
+
+    scope = "login_email"
+
+    def get_cache_key(self, request, view):
+        # A body that isn't a JSON object is left for the serializer to reject.
+        if not isinstance(request.data, Mapping):
+            return None
+        email = request.data.get("email")
+        if not isinstance(email, str) or not email.strip():
+            return None
+        ident = hashlib.sha256(email.strip().lower().encode()).hexdigest()
+        return self.cache_format % {"scope": self.scope, "ident": ident}
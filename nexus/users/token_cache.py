@@ -0,0 +1,38 @@
+"""
+Token -> user snapshots in the "auth" cache, read by
+users.authentication.CachedTokenAuthentication and dropped by users.signals.
+Kept apart from the authentication class so that the signal handlers, which
+load in every process including Celery workers, don't import DRF's
+authentication stack.
+"""
+
+import hashlib
+
+from django.core.cache import caches
+
+CACHE_ALIAS = "auth"
+SNAPSHOT_FIELDS = ("id", "email", "role", "is_active", "is_staff", "is_superuser")
+
+
+def token_cache_key(key):
+    # Hash the token so a shared cache backend never holds usable credentials.
+    return "auth:token:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+def remember_token(key, user):
+    """Cache the snapshot for `user` under token `key`; inactive users are never cached."""
+    if user.is_active:
+        caches[CACHE_ALIAS].set(
+            token_cache_key(key), {field: getattr(user, field) for field in SNAPSHOT_FIELDS}
+        )
+
+
+def invalidate_tokens(*keys):
+    """Drop cached snapshots for the given token keys."""
+    caches[CACHE_ALIAS].delete_many([token_cache_key(key) for key in keys if key])
+
+
+def invalidate_user_tokens(user_id):
+    from rest_framework.authtoken.models import Token
+
+    invalidate_tokens(*Token.objects.filter(user_id=user_id).values_list("key", flat=True))
@@ -1,9 +1,10 @@
 from django.urls import path
 
-from .views import RegisterView, EmailObtainAuthToken, ProfileView
+from .views import RegisterView, EmailObtainAuthToken, ProfileView, RevokeTokenView
 
 urlpatterns = [
     path("register/", RegisterView.as_view(), name="register"),
     path("login/", EmailObtainAuthToken.as_view(), name="login"),
+    path("logout/", RevokeTokenView.as_view(), name="logout"),
     path("profile/", ProfileView.as_view(), name="profile"),
 ]
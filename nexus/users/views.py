@@ -1,14 +1,19 @@
-from rest_framework import generics, permissions
+from asgiref.sync import sync_to_async
+from rest_framework import generics, permissions, status
 from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.response import Response
-from drf_yasg.utils import swagger_auto_schema
 
+from courses.search import reindex_courses
+from nexus.docs import no_body, swagger_auto_schema
+from nexus.views import AsyncAPIViewMixin
+from .token_cache import remember_token
 from .serializers import (
     RegisterSerializer,
     UserSerializer,
     EmailAuthTokenSerializer,
 )
+from .throttles import LoginEmailRateThrottle, LoginIPRateThrottle
 
 
 class RegisterView(generics.CreateAPIView):
@@ -17,32 +22,60 @@ class RegisterView(generics.CreateAPIView):
     permission_classes = [permissions.AllowAny]
 
     def create(self, request, *args, **kwargs):
-        response = super().create(request, *args, **kwargs)
-        user = self.get_serializer().instance
-        token, _ = Token.objects.get_or_create(user=user)
-        response.data = {
-            "user": UserSerializer(user).data,
-            "token": token.key,
-        }
-        return response
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = serializer.save()
+        remember_token(user.auth_token.key, user)
+        return Response(
+            {
+                "user": UserSerializer(user).data,
+                "token": user.auth_token.key,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
 
+class EmailObtainAuthToken(AsyncAPIViewMixin, ObtainAuthToken):
+    """
+    Async so that under ASGI the password hash runs on the hashing pool
+    (users.hashers) instead of the thread shared by every sync view.
+    """
 
-class EmailObtainAuthToken(ObtainAuthToken):
     swagger_tags = ["Users"]
     serializer_class = EmailAuthTokenSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [LoginIPRateThrottle, LoginEmailRateThrottle]
 
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         serializer = self.serializer_class(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
-        user = serializer.validated_data["user"]
-        token, _ = Token.objects.get_or_create(user=user)
+        user = await serializer.aauthenticate()
+        token, _ = await Token.objects.aget_or_create(user=user)
+        await sync_to_async(remember_token)(token.key, user)
         return Response({"token": token.key, "user": UserSerializer(user).data})
 
 
+class RevokeTokenView(generics.GenericAPIView):
+    """Log out by deleting the caller's token; the next login issues a new one."""
+
+    swagger_tags = ["Users"]
+
+    @swagger_auto_schema(request_body=no_body, responses={204: "Token revoked"})
+    def post(self, request, *args, **kwargs):
+        # Deleting the token also evicts its cached snapshot (users.signals).
+        Token.objects.filter(user=request.user).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class ProfileView(generics.RetrieveUpdateAPIView):
     swagger_tags = ["Users"]
     serializer_class = UserSerializer
 
     def get_object(self):
         return self.request.user
+
+    def perform_update(self, serializer):
+        user = serializer.save()
+        if user.role == user.Role.TEACHER:
+            # Teacher names are part of the course search documents.
+            reindex_courses(user.courses.values_list("id", flat=True))